@@ -0,0 +1,184 @@
+import hashlib
+import random
+import threading
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import NamedTuple
+
+# Synthetic Vietnamese health-news corpus for benchmark.py, served by a local
+# HTTP stand-in for the real RSS sites (ETag / If-None-Match supported).
+# Trusted article links use host "localhost", untrusted ones "127.0.0.1", so
+# whitelisting "localhost" splits them like real news domains.
+
+DISEASES = [
+    "sốt xuất huyết", "sởi", "tay chân miệng", "cúm A", "bạch hầu", "ho gà", "thủy đậu",
+    "viêm não nhật bản", "não mô cầu", "cúm gia cầm", "bệnh dại", "Covid-19",
+]
+LOCATIONS = [
+    "Hà Nội", "TP.HCM", "Đà Nẵng", "Hải Phòng", "Cần Thơ", "Nghệ An", "Thanh Hóa", "Khánh Hòa",
+    "Đắk Lắk", "Quảng Ninh", "quận 8", "huyện Củ Chi", "Bình Dương", "Đồng Nai", "Gia Lai",
+]
+COUNTS = ["12", "35", "120", "1.250", "hàng chục", "hàng trăm", "hai mươi lăm", "mười hai", "vài chục"]
+UNITS = ["ca mắc", "ca", "trường hợp", "bệnh nhân", "ca dương tính"]
+
+MATCHED_TITLES = [
+    "{location} ghi nhận thêm {count} {unit} {disease}",
+    "{disease} bùng phát tại {location}, {count} {unit} nhập viện",
+    "Cảnh báo ổ dịch {disease} ở {location}",
+    "{location}: {count} {unit} {disease} trong tuần qua",
+    "Số {unit} {disease} tại {location} tăng mạnh",
+]
+OTHER_TITLES = [
+    "Bí quyết ngủ ngon mùa nắng nóng",
+    "Ăn gì để tăng cường sức đề kháng cho trẻ",
+    "Bệnh viện {location} khai trương khoa mới",
+    "Tư vấn dinh dưỡng cho người cao tuổi",
+    "Mẹo giảm cân an toàn sau Tết",
+    "Hỏi đáp: có nên uống vitamin mỗi ngày",
+    "{location} tổ chức hội thảo về y tế cơ sở",
+    "Bộ Y tế hướng dẫn khám sức khỏe định kỳ",
+]
+SENTENCES = [
+    "Trung tâm Kiểm soát bệnh tật cho biết số ca mắc tăng so với cùng kỳ năm trước.",
+    "Ngành y tế khuyến cáo người dân chủ động phòng bệnh và đến cơ sở y tế khi có triệu chứng.",
+    "Các bệnh viện tuyến cuối đang quá tải, nhiều bệnh nhân phải nằm ghép.",
+    "Chính quyền địa phương đã tổ chức phun hóa chất diệt muỗi tại các điểm nóng.",
+    "Chuyên gia khuyên phụ huynh đưa trẻ đi tiêm chủng đầy đủ, đúng lịch.",
+    "Sở Y tế yêu cầu các đơn vị tăng cường giám sát, phát hiện sớm ca bệnh.",
+]
+SOURCES = ["vnexpress", "dantri", "tuoitre", "thanhnien", "suckhoedoisong", "vov", "nhandan"]
+
+class Corpus(NamedTuple):
+    feed_paths: list[str] # "/feeds/<n>.rss"
+    pages: dict # path -> (content_type, body bytes)
+    entries: int
+    matched: int # entries whose title carries a monitored disease
+    article_paths: list[tuple[str, str]] # (host, path) of every article page
+
+def fill(template: str, rng: random.Random) -> str:
+    return template.format(
+        location=rng.choice(LOCATIONS), count=rng.choice(COUNTS), unit=rng.choice(UNITS), disease=rng.choice(DISEASES)
+    )
+
+def article_html(title: str, summary: str, body: list[str]) -> bytes:
+    paragraphs = "".join(f"<p>{escape(p)}</p>" for p in body)
+    return (
+        f"<!DOCTYPE html><html lang=\"vi\"><head><meta charset=\"utf-8\"><title>{escape(title)}</title>"
+        f"<meta name=\"description\" content=\"{escape(summary)}\"></head>"
+        f"<body><article><h1>{escape(title)}</h1>{paragraphs}</article></body></html>"
+    ).encode("utf-8")
+
+def rss_xml(source: str, items: list[str]) -> bytes:
+    return (
+        "<?xml version=\"1.0\" encoding=\"UTF-8\"?><rss version=\"2.0\"><channel>"
+        f"<title>{source} - Sức khỏe</title><link>https://{source}.vn</link><description>Tin sức khỏe</description>"
+        + "".join(items) + "</channel></rss>"
+    ).encode("utf-8")
+
+def generate_corpus(base_port: int, feeds: int = 11, entries: int = 50, keyword_density: float = 0.3,
+                    trusted_ratio: float = 0.8, duplicate_ratio: float = 0.05, seed: int = 42) -> Corpus:
+    """
+    `feeds` RSS documents of `entries` items each, newest first.
+    keyword_density: share of titles about a monitored disease (with counts
+    and locations); duplicate_ratio: share of items re-publishing an earlier
+    story (same title, other link), like syndicated news.
+    """
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+    pages = {}
+    feed_paths = []
+    article_paths = []
+    titles = []
+    matched = 0
+
+    for f in range(feeds):
+        source = SOURCES[f % len(SOURCES)]
+        items = []
+        for e in range(entries):
+            is_match = rng.random() < keyword_density
+            if titles and rng.random() < duplicate_ratio:
+                title = rng.choice(titles)
+            else:
+                title = fill(rng.choice(MATCHED_TITLES if is_match else OTHER_TITLES), rng)
+                titles.append(title)
+            matched += is_match
+            summary = " ".join([fill(rng.choice(MATCHED_TITLES), rng) + "." if is_match else "", *rng.sample(SENTENCES, 2)]).strip()
+            host = "localhost" if rng.random() < trusted_ratio else "127.0.0.1"
+            path = f"/{source}/{f}-{e}.html"
+            link = f"http://{host}:{base_port}{path}"
+            published = now - timedelta(minutes=f + e * 30)
+            pages[path] = ("text/html; charset=utf-8", article_html(title, summary, rng.sample(SENTENCES, 4)))
+            article_paths.append((host, path))
+            items.append(
+                f"<item><title>{escape(title)}</title><link>{escape(link)}</link><guid>{escape(link)}</guid>"
+                f"<description>{escape(summary)}</description>"
+                f"<pubDate>{format_datetime(published, usegmt=True)}</pubDate></item>"
+            )
+        feed_path = f"/feeds/{f}.rss"
+        pages[feed_path] = ("application/rss+xml; charset=utf-8", rss_xml(source, items))
+        feed_paths.append(feed_path)
+
+    return Corpus(feed_paths, pages, feeds * entries, matched, article_paths)
+
+class CorpusServer:
+    """
+    Serves a Corpus on 127.0.0.1 from a background thread:
+        with CorpusServer(port) as server: server.set_corpus(corpus); ...
+    Port 0 picks a free port (see .port).
+    """
+
+    def __init__(self, port: int = 0):
+        self.pages = {}
+        self.requests = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                server.requests += 1
+                page = server.pages.get(self.path.split("?")[0])
+                if page is None:
+                    self.send_error(404)
+                    return
+                content_type, body = page
+                etag = '"' + hashlib.md5(body).hexdigest() + '"'
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self._httpd.daemon_threads = True
+        self.port = self._httpd.server_address[1]
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    def set_corpus(self, corpus: Corpus):
+        self.pages = corpus.pages
+
+    def feed_urls(self, corpus: Corpus) -> list[str]:
+        return [f"http://127.0.0.1:{self.port}{path}" for path in corpus.feed_paths]
+
+    def article_urls(self, corpus: Corpus) -> list[str]:
+        return [f"http://{host}:{self.port}{path}" for host, path in corpus.article_paths]
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._httpd.shutdown()
+        self._httpd.server_close()
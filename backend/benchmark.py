@@ -0,0 +1,265 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+# Offline scan benchmark: python -m backend.benchmark [--feeds 11 --entries 50 ...]
+# Serves a synthetic corpus (bench_corpus.py) from a local HTTP server and
+# runs against throwaway SQLite databases; never touches DATABASE_URL.
+# Results are written as JSON; --compare prints the change against an older run.
+
+WORK_DIR = tempfile.mkdtemp(prefix="episcout-bench-")
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(WORK_DIR, "unused.db")
+os.environ.setdefault("RS_CACHE_PATH", "") # snippet stage must hit the server
+
+from sqlalchemy.orm import sessionmaker
+from backend import database, models, crud, crawler, schemas, search, extraction, rs
+from backend.bench_corpus import CorpusServer, generate_corpus, DISEASES
+from backend.dedup import NearDuplicateIndex
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_results")
+
+_db_count = 0
+
+def fresh_session():
+    # New SQLite file per run so every ingest/scan starts from an empty database
+    global _db_count
+    _db_count += 1
+    engine = database.create_db_engine("sqlite:///" + os.path.join(WORK_DIR, f"bench-{_db_count}.db"))
+    models.Base.metadata.create_all(bind=engine)
+    search.ensure_index(engine)
+    return engine, sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+
+def setup_db(db, keywords):
+    for kw in keywords:
+        crud.create_keyword(db, schemas.KeywordCreate(text=kw))
+    crud.create_whitelist_domain(db, schemas.WhitelistCreate(domain="localhost"))
+
+def summarize(durations: list[float], items: int) -> dict:
+    ordered = sorted(durations)
+    median = statistics.median(ordered)
+    return {
+        "runs": len(ordered),
+        "items": items,
+        "min_s": round(ordered[0], 6),
+        "median_s": round(median, 6),
+        "p95_s": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 6),
+        "max_s": round(ordered[-1], 6),
+        "per_item_ms": round(median / items * 1000, 4) if items else None,
+        "items_per_s": round(items / median, 1) if median else None,
+    }
+
+def timed(fn, repeat: int, setup=None) -> list[float]:
+    durations = []
+    for _ in range(repeat):
+        state = setup() if setup else None
+        start = time.perf_counter()
+        fn(state)
+        durations.append(time.perf_counter() - start)
+    return durations
+
+def parsed_entries(corpus) -> list[dict]:
+    # (title, summary, link, published) of every corpus entry, parsed once up front
+    import feedparser
+    entries = []
+    for path in corpus.feed_paths:
+        feed = feedparser.parse(corpus.pages[path][1])
+        for e in feed.entries:
+            entries.append({
+                "title": e.get("title", ""), "summary": e.get("summary", ""),
+                "link": e.get("link", ""), "published": crawler.parse_date(e),
+            })
+    return entries
+
+# --- Stages ---
+
+def bench_matching(entries, keywords, repeat):
+    titles = [e["title"] for e in entries]
+    crawler.matches_keywords(titles[0], keywords) # build the automaton outside the timing
+    return summarize(timed(lambda _: [crawler.matches_keywords(t, keywords) for t in titles], repeat), len(titles))
+
+def bench_extraction(entries, keywords, repeat):
+    matched = [e for e in entries if crawler.matches_keywords(e["title"], keywords)]
+    extraction.get_case_extractor(keywords)
+    durations = timed(lambda _: [extraction.extract_cases(e["title"], e["summary"], keywords, e["published"]) for e in matched], repeat)
+    return summarize(durations, len(matched))
+
+def bench_dedup(entries, repeat):
+    titles = [e["title"].lower().strip() for e in entries]
+    def run(_):
+        index = NearDuplicateIndex(threshold=95)
+        for t in titles:
+            index.add_if_new(t)
+    return summarize(timed(run, repeat), len(titles))
+
+def bench_ingest(entries, keywords, repeat):
+    batch = []
+    for e in entries:
+        matched = crawler.matches_keywords(e["title"], keywords)
+        if not matched:
+            continue
+        article = schemas.ArticleCreate(
+            title=e["title"], link=e["link"], summary=e["summary"], source=crawler.get_domain(e["link"]),
+            published_date=e["published"], keywords_matched=matched, is_whitelisted=True,
+            tags=", ".join(crawler.detect_tags(e["title"], e["published"])) or None
+        )
+        batch.append((article, extraction.extract_cases(e["title"], e["summary"], keywords, e["published"])))
+
+    def setup():
+        return fresh_session()
+
+    def run(state):
+        engine, db = state
+        try:
+            crud.ingest_articles(db, batch)
+        finally:
+            db.close()
+            engine.dispose()
+    return summarize(timed(run, repeat, setup), len(batch))
+
+def bench_scan(server, corpus, keywords, repeat):
+    """
+    cold: empty database, every feed downloaded and parsed.
+    warm: second scan of the same database; feeds answer 304 via ETag.
+    """
+    feed_urls = server.feed_urls(corpus)
+    saved_feeds = crawler.RSS_FEEDS
+    crawler.RSS_FEEDS = feed_urls
+    cold, warm, saved = [], [], []
+    timings = {}
+    try:
+        for _ in range(repeat):
+            engine, db = fresh_session()
+            try:
+                setup_db(db, keywords)
+                start = time.perf_counter()
+                result = crawler.scan_news(db, fetch_unknown=False, timings=timings)
+                cold.append(time.perf_counter() - start)
+                saved.append(result.saved_trusted_count)
+
+                start = time.perf_counter()
+                crawler.scan_news(db, fetch_unknown=False)
+                warm.append(time.perf_counter() - start)
+            finally:
+                db.close()
+                engine.dispose()
+    finally:
+        crawler.RSS_FEEDS = saved_feeds
+
+    cold_stats = summarize(cold, corpus.entries)
+    cold_stats["saved"] = saved[-1]
+    cold_stats["per_feed_ms"] = round(cold_stats["median_s"] / len(feed_urls) * 1000, 3)
+    cold_stats["stages_last_run_s"] = timings.get("stages", {}) # scan_news breakdown (see metrics.py)
+    warm_stats = summarize(warm, len(feed_urls))
+    return cold_stats, warm_stats
+
+def bench_snippets(server, corpus, repeat, workers):
+    urls = server.article_urls(corpus)
+    rs.disable_snippet_cache()
+    return summarize(timed(lambda _: rs.fetch_snippets(urls, workers), repeat), len(urls))
+
+# --- Reporting ---
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10).stdout.strip() or None
+    except Exception:
+        return None
+
+def compare(results: dict, baseline_path: str, threshold: float) -> list[str]:
+    # Stages whose median got slower than `threshold` percent
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    regressions = []
+    print(f"\nCompared with {baseline_path} ({baseline['meta'].get('commit')}):")
+    if baseline["meta"].get("params") != results["meta"]["params"]:
+        print(f"  note: run parameters differ ({baseline['meta'].get('params')})")
+    for name, stage in results["stages"].items():
+        old = baseline["stages"].get(name)
+        if not old or not old.get("median_s"):
+            continue
+        change = (stage["median_s"] - old["median_s"]) / old["median_s"] * 100
+        flag = ""
+        if change > threshold:
+            flag = "  <-- regression"
+            regressions.append(name)
+        print(f"  {name:<12} {old['median_s']:.4f}s -> {stage['median_s']:.4f}s ({change:+.1f}%){flag}")
+    return regressions
+
+def run_benchmarks(args) -> dict:
+    keywords = DISEASES + ["ổ dịch", "bùng phát"]
+    stages = {}
+    with CorpusServer() as server:
+        corpus = generate_corpus(server.port, feeds=args.feeds, entries=args.entries, keyword_density=args.density,
+                                 trusted_ratio=args.trusted, duplicate_ratio=args.duplicates, seed=args.seed)
+        server.set_corpus(corpus)
+        entries = parsed_entries(corpus)
+
+        print(f"Corpus: {args.feeds} feeds x {args.entries} entries, {corpus.matched} on monitored diseases")
+        stages["matching"] = bench_matching(entries, keywords, args.repeat)
+        stages["extraction"] = bench_extraction(entries, keywords, args.repeat)
+        stages["dedup"] = bench_dedup(entries, args.repeat)
+        stages["ingest"] = bench_ingest(entries, keywords, args.repeat)
+        stages["scan_cold"], stages["scan_warm"] = bench_scan(server, corpus, keywords, args.repeat)
+        if not args.skip_snippets:
+            stages["snippets"] = bench_snippets(server, corpus, args.repeat, args.workers)
+
+    return {
+        "meta": {
+            "timestamp": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "params": {k: v for k, v in vars(args).items() if k not in ("output", "compare", "fail_over")},
+        },
+        "stages": stages,
+    }
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Offline scan benchmark on a synthetic RSS corpus")
+    arg_parser.add_argument("--feeds", type=int, default=11)
+    arg_parser.add_argument("--entries", type=int, default=50, help="Entries per feed")
+    arg_parser.add_argument("--density", type=float, default=0.3, help="Share of entries about a monitored disease")
+    arg_parser.add_argument("--trusted", type=float, default=0.8, help="Share of entries on whitelisted domains")
+    arg_parser.add_argument("--duplicates", type=float, default=0.05, help="Share of re-published titles")
+    arg_parser.add_argument("--seed", type=int, default=42)
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    arg_parser.add_argument("--workers", type=int, default=rs.FETCH_WORKERS, help="Snippet fetch workers")
+    arg_parser.add_argument("--skip-snippets", action="store_true", help="Skip the rs.py article page stage")
+    arg_parser.add_argument("--output", help="Result file (default bench_results/<timestamp>-<commit>.json)")
+    arg_parser.add_argument("--compare", help="Earlier result file to compare against")
+    arg_parser.add_argument("--fail-over", type=float, default=None,
+                            help="With --compare: exit 1 if a stage median is slower by more than this percent "
+                                 "(default: only flag stages more than 10%% slower)")
+    args = arg_parser.parse_args()
+
+    results = run_benchmarks(args)
+
+    print(f"\n{'stage':<12} {'items':>7} {'median s':>10} {'p95 s':>10} {'ms/item':>9} {'items/s':>10}")
+    for name, stage in results["stages"].items():
+        print(f"{name:<12} {stage['items']:>7} {stage['median_s']:>10.4f} {stage['p95_s']:>10.4f} "
+              f"{stage['per_item_ms'] or 0:>9.3f} {stage['items_per_s'] or 0:>10.1f}")
+
+    output = args.output
+    if not output:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%S")
+        output = os.path.join(RESULTS_DIR, f"{stamp}-{results['meta']['commit'] or 'nogit'}.json")
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.fail_over if args.fail_over is not None else 10.0)
+        if regressions and args.fail_over is not None:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
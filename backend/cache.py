@@ -0,0 +1,89 @@
+import os
+import threading
+import time
+
+class TTLCache:
+    """
+    Small thread-safe in-process cache with per-entry TTL, explicit
+    invalidation and hit/miss counters.
+    Concurrent misses on the same key compute the value once; a value computed
+    across an invalidate() is returned but not stored (it may be stale).
+    At most max_entries values are kept (expired ones, then the oldest, go first).
+    """
+
+    def __init__(self, ttl: float, max_entries: int = 256):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries = {} # key -> (expires_at, value)
+        self._key_locks = {} # key -> lock, only while a value is being computed
+        self._generation = 0
+
+    def get_or_compute(self, key, compute):
+        value = self._get(key)
+        if value is not None:
+            return value
+
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            # Another thread may have filled it while we waited
+            value = self._get(key)
+            if value is not None:
+                return value
+
+            with self._lock:
+                self.misses += 1
+                generation = self._generation
+            try:
+                value = compute()
+                with self._lock:
+                    if generation == self._generation:
+                        self._store(key, value)
+            finally:
+                # Waiters already hold this lock; later callers find the stored value
+                with self._lock:
+                    self._key_locks.pop(key, None)
+            return value
+
+    def _store(self, key, value):
+        # Caller holds _lock
+        now = time.monotonic()
+        if key not in self._entries and len(self._entries) >= self.max_entries:
+            for k in [k for k, (expires_at, _) in self._entries.items() if expires_at <= now]:
+                del self._entries[k]
+            while len(self._entries) >= self.max_entries:
+                del self._entries[next(iter(self._entries))]
+        self._entries.pop(key, None)
+        self._entries[key] = (now + self.ttl, value)
+
+    def _get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > time.monotonic():
+                self.hits += 1
+                return entry[1]
+            if entry:
+                del self._entries[key]
+            return None
+
+    def invalidate(self):
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl
+            }
+
+# Dashboard aggregates (stats.py); invalidated by every write in crud
+stats_cache = TTLCache(ttl=float(os.getenv("STATS_CACHE_TTL", "60")),
+                       max_entries=int(os.getenv("STATS_CACHE_MAX_ENTRIES", "256")))
@@ -1,10 +1,14 @@
-import feedparser
 from sqlalchemy.orm import Session
-from . import schemas, crud, models
+from . import schemas, crud, extraction, feeds, matcher, metrics, urls, whitelist
+from .dedup import NearDuplicateIndex
+import functools
+import hashlib
 from datetime import datetime, timedelta
 import logging
+import os
+import time
+from collections import defaultdict
 from urllib.parse import urlparse
-import re
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +27,15 @@ RSS_FEEDS = [
     "http://cand.com.vn/rss/suc-khoe-c-5"
 ]
 
+# Optional: skip matched entries whose title is a near duplicate (fuzz.ratio >= 95)
+# of one already taken in the same scan from a source of the same trust, e.g. the
+# same story syndicated under another URL. Off by default: titles that only differ
+# in a case count or location ("12 ca sởi ở X" / "13 ca sởi ở X") also reach 95.
+DEDUP_TITLES = os.getenv("SCAN_DEDUP_TITLES", "0").lower() in ("1", "true", "yes")
+
+# Trusted articles are stored in one transaction per this many (and at the end of the scan)
+INGEST_BATCH_SIZE = int(os.getenv("SCAN_INGEST_BATCH_SIZE", "200"))
+
 # Keywords to exclude articles that are advice/QA/general discussions
 EXCLUDED_KEYWORDS = [
     "tư vấn", "hỏi đáp", "lời khuyên", "có nên", 
@@ -30,58 +43,30 @@ EXCLUDED_KEYWORDS = [
     "bí quyết", "mẹo", "ăn gì", "uống gì"
 ]
 
+@functools.lru_cache(maxsize=4096)
 def get_domain(url: str) -> str:
+    # Lowercase host without "www.", port or credentials
     try:
-        netloc = urlparse(url).netloc
-        return netloc.lower().replace("www.", "")
-    except:
+        host = urlparse(url).hostname or ""
+    except ValueError:
         return ""
+    host = host.rstrip(".")
+    return host[4:] if host.startswith("www.") else host
 
 def matches_keywords(text: str, keywords: list[str]) -> str | None:
-    if not text:
-        return None
-    text_lower = text.lower()
-    
-    # Check exclusion first
-    for ex in EXCLUDED_KEYWORDS:
-        if ex in text_lower:
-            return None
+    # Compiled automaton, shared across scans (see matcher.py)
+    return matcher.get_keyword_matcher(keywords, EXCLUDED_KEYWORDS).match(text)
 
-    matched = []
-    for kw in keywords:
-        if kw.lower() in text_lower:
-            matched.append(kw)
-    return ", ".join(matched) if matched else None
+def entry_key(entry) -> str:
+    # Stable fixed-width id of a feed entry (GUID, falling back to the link)
+    key = entry.get('id') or entry.get('link', '')
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
 
 def parse_date(entry) -> datetime:
     if hasattr(entry, 'published_parsed') and entry.published_parsed:
         return datetime(*entry.published_parsed[:6])
     return datetime.utcnow()
 
-def extract_case_count(text: str, disease_keywords: list[str]) -> int:
-    """
-    Simulated NLP: regex to find 'X ca mắc', 'X trường hợp' near keywords.
-    """
-    if not text: return 0
-    
-    # Regex for "X cases"
-    # Examples: "15 ca mắc", "thêm 20 trường hợp", "gần 100 người nhiễm"
-    patterns = [
-        r"(\d+)\s+(ca\s+mắc|trường\s+hợp|người\s+nhiễm|ca\s+dương\s+tính)",
-        r"(phát\s+hiện|ghi\s+nhận)\s+(\d+)\s+(ca|trường\s+hợp)"
-    ]
-    
-    for pat in patterns:
-        match = re.search(pat, text.lower())
-        if match:
-            # Check if group 1 is digit or group 2 is digit (depending on pattern)
-            val1 = match.group(1)
-            val2 = match.group(2)
-            if val1.isdigit(): return int(val1)
-            if val2.isdigit(): return int(val2)
-            
-    return 0
-
 def detect_tags(title: str, pub_date: datetime) -> list[str]:
     tags = []
     # 1. "Mới" tag: < 5 hours
@@ -96,45 +81,120 @@ def detect_tags(title: str, pub_date: datetime) -> list[str]:
         
     return tags
 
-def scan_news(db: Session, fetch_unknown: bool) -> schemas.ScanResult:
+def iter_scan(db: Session, fetch_unknown: bool, force: bool = False, timings: dict | None = None):
+    """
+    Run a scan, yielding events as soon as they are ready:
+        {"type": "article", "trusted": bool, "article": ArticleCreate}  matched entry
+        {"type": "feed", "url", "status", "entries", "matched"}          feed processed
+        {"type": "saved", "count", "total"}                              a batch of trusted articles stored
+        {"type": "done", "saved_trusted_count", "unknown_count"}
+    Each feed is matched as soon as its download arrives. Trusted articles
+    are stored and unknown-source ones queued in pending_articles (see
+    crud.stage_pending_articles) in batches of INGEST_BATCH_SIZE, so memory
+    does not grow with the number of matches. Unknown article events are
+    only emitted when fetch_unknown is set.
+    `timings`, if given, is filled with the per-stage and per-feed breakdown
+    that is also exported to /api/metrics.
+    """
+    scan_start = time.perf_counter()
+    stage = defaultdict(float) # stage -> seconds in this scan
+    feed_timings = {}
+    processed = matched_total = saved_total = unknown_total = 0
+
     # 1. Get Keywords and Whitelist
     keywords_obj = crud.get_keywords(db)
     keywords = [k.text for k in keywords_obj]
     
     if not keywords:
         logger.warning("No keywords found to scan.")
-        return schemas.ScanResult(saved_trusted_count=0, unknown_articles=[])
+        yield {"type": "done", "saved_trusted_count": 0, "unknown_count": 0}
+        return
 
-    whitelist_objs = crud.get_whitelisted_domains(db)
-    whitelist = [w.domain.lower() for w in whitelist_objs]
-
-    # Add default VN trusted domains if whitelist is empty
-    if not whitelist:
-        whitelist = [
-            "vnexpress.net", "dantri.com.vn", "tuoitre.vn", "thanhnien.vn", 
-            "suckhoedoisong.vn", "tienphong.vn", "laodong.vn", 
-            "vietnamnet.vn", "nhandan.vn", "cand.com.vn"
-        ]
+    # Suffix trie of the active domains (default VN trusted domains if there are none),
+    # rebuilt only when the whitelist changed
+    trusted_domains = whitelist.get_whitelist(
+        crud.get_whitelist_signature(db), lambda: crud.get_active_whitelist_domains(db)
+    )
 
-    saved_count = 0
-    unknown_articles_list = []
-    seen_links = set()
+    seen_hashes = set() # canonical link hashes seen in this scan
+    # Per trust class, so an untrusted copy never hides the trusted one
+    seen_titles = {True: NearDuplicateIndex(threshold=95), False: NearDuplicateIndex(threshold=95)}
+    pending = [] # (article_dto, cases) of trusted entries not stored yet
+    unknown = [] # article_dto of unknown-source entries not queued yet
+    pending_feeds = [] # (FeedResult, top entry hash, newest date) waiting for their articles to be stored
     
-    # 2. Crawl Feeds
-    for feed_url in RSS_FEEDS:
+    # Conditional-GET validators and entry watermarks from the previous scan.
+    # Unknown-source articles seen before are already in the review queue.
+    cache = {}
+    watermarks = {} # feed url -> (last_entry_hash, newest_published)
+    if not force:
+        for state in crud.get_feed_states(db, RSS_FEEDS):
+            cache[state.url] = {"etag": state.etag, "last_modified": state.last_modified, "content_hash": state.content_hash}
+            watermarks[state.url] = (state.last_entry_hash, state.newest_published)
+    cutoff = datetime.utcnow() - timedelta(days=5)
+    stage["setup"] = time.perf_counter() - scan_start
+
+    # 2. Crawl Feeds (downloaded concurrently, processed as each one arrives)
+    for result in metrics.timed_iter(feeds.fetch_feeds(RSS_FEEDS, cache), stage, "fetch_wait"):
+        feed_url = result.url
+        feed_start = time.perf_counter()
+        feed_timings[feed_url] = {"status": result.status, "fetch_s": round(result.fetch_seconds, 6),
+                                  "parse_s": round(result.parse_seconds, 6), "entries": 0, "matched": 0}
+        if result.status in ("not_modified", "unchanged"):
+            logger.info(f"Feed {feed_url} {result.status}, skipping")
+            crud.save_feed_state(db, feed_url, result.etag, result.last_modified, result.content_hash)
+            yield {"type": "feed", "url": feed_url, "status": result.status, "entries": 0, "matched": 0}
+            continue
+        if result.feed is None:
+            yield {"type": "feed", "url": feed_url, "status": result.status, "entries": 0, "matched": 0}
+            continue
+
+        matched = 0
+        candidates = [] # (article_dto, cases) of this feed's trusted entries
+        unknown_candidates = [] # article_dto of this feed's unknown-source entries
+        events = [] # article events, released once the feed parsed cleanly
+        last_hash, newest = watermarks.get(feed_url, (None, None))
+        top_hash = None # first (newest) entry of this download
+        feed_newest = newest
+        status = result.status
         try:
-            feed = feedparser.parse(feed_url)
-            for entry in feed.entries:
+            for entry in result.feed.entries:
+                key = entry_key(entry)
+                if top_hash is None:
+                    top_hash = key
+
+                # Incremental scan: everything from the previous top entry down was already seen
+                if key == last_hash:
+                    break
+                processed += 1
+
+                # Publish Date
+                pub_date = parse_date(entry)
+                if entry.get('published_parsed'):
+                    if newest and pub_date < newest:
+                        continue
+                    if feed_newest is None or pub_date > feed_newest:
+                        feed_newest = pub_date
+
+                # Limit to 5 days
+                if pub_date < cutoff:
+                    continue
+
                 link = entry.get('link', '')
-                if not link or link in seen_links:
+                if not link:
+                    continue
+                link_hash = urls.link_hash(link)
+                if link_hash in seen_hashes:
                     continue
-                seen_links.add(link)
+                seen_hashes.add(link_hash)
 
                 title = entry.get('title', '')
                 summary = entry.get('summary', '') or entry.get('description', '')
                 
                 # Keyword check
+                t = time.perf_counter()
                 matched_kw_str = matches_keywords(title, keywords)
+                stage["match"] += time.perf_counter() - t
                 if not matched_kw_str:
                      # Check summary if title failed? (Optional simplification: focus on title for accuracy)
                      pass
@@ -142,23 +202,24 @@ def scan_news(db: Session, fetch_unknown: bool) -> schemas.ScanResult:
                 if not matched_kw_str:
                     continue
 
-                # Publish Date
-                pub_date = parse_date(entry)
-                
-                # Limit to 5 days
-                if pub_date < datetime.utcnow() - timedelta(days=5):
-                    continue
+                # Whitelist Check
+                source_domain = get_domain(link)
+                is_trusted = trusted_domains.matches(source_domain)
+
+                # Near-duplicate title (same story under another link)
+                if DEDUP_TITLES:
+                    t = time.perf_counter()
+                    is_new = seen_titles[is_trusted].add_if_new(title.lower().strip())
+                    stage["dedup"] += time.perf_counter() - t
+                    if not is_new:
+                        continue
+                matched += 1
 
                 # Prepare Data
-                source_domain = get_domain(link)
-                
                 # Tags
                 tags_list = detect_tags(title, pub_date)
                 tags_str = ", ".join(tags_list) if tags_list else None
                 
-                # Case Extraction
-                case_count = extract_case_count(title + " " + summary, keywords)
-
                 article_dto = schemas.ArticleCreate(
                     title=title,
                     link=link,
@@ -170,39 +231,110 @@ def scan_news(db: Session, fetch_unknown: bool) -> schemas.ScanResult:
                     tags=tags_str
                 )
 
-                # Whitelist Check
-                is_trusted = any(w in source_domain for w in whitelist)
-                
                 if is_trusted:
                     article_dto.is_whitelisted = True
-                    # Auto Save
-                    existing = crud.get_article_by_link(db, link)
-                    if not existing:
-                        # Save Article
-                        saved_article = crud.create_article(db, article_dto)
-                        
-                        # Save DiseaseCase if count > 0
-                        if case_count > 0:
-                            # Primary disease from matched string (take first one)
-                            first_kw = matched_kw_str.split(", ")[0]
-                            crud.create_disease_case(db, models.DiseaseCase(
-                                article_id=saved_article.id,
-                                disease_name=first_kw,
-                                case_count=case_count,
-                                location="Việt Nam", # Placeholder, would need NER for location
-                                report_date=pub_date
-                            ))
-                        
-                        saved_count += 1
+                    # DiseaseCase rows: every (disease, count, location) in title + summary
+                    t = time.perf_counter()
+                    cases = extraction.extract_cases(title, summary, keywords, pub_date)
+                    stage["extract"] += time.perf_counter() - t
+                    candidates.append((article_dto, cases))
+                    events.append({"type": "article", "trusted": True, "article": article_dto})
                 else:
+                    # Queued for review; cases are extracted on approval
+                    unknown_candidates.append(article_dto)
                     if fetch_unknown:
-                        unknown_articles_list.append(article_dto) # Cases not saved until user approves
+                        events.append({"type": "article", "trusted": False, "article": article_dto})
                         
         except Exception as e:
             logger.error(f"Error parsing feed {feed_url}: {e}")
-            continue
+            status = "error"
+            candidates = []
+            unknown_candidates = []
+        stage["process"] += time.perf_counter() - feed_start
+        matched_total += matched
+        feed_timings[feed_url].update(status=status, entries=len(result.feed.entries), matched=matched)
+
+        if status != "error":
+            yield from events
+            unknown_total += len(unknown_candidates)
+            pending.extend(candidates)
+            unknown.extend(unknown_candidates)
+            pending_feeds.append((result, top_hash or last_hash, feed_newest))
+        yield {"type": "feed", "url": feed_url, "status": status, "entries": len(result.feed.entries), "matched": matched}
+
+        if len(pending) + len(unknown) >= INGEST_BATCH_SIZE:
+            saved, pending, unknown, pending_feeds = _store_batch(db, pending, unknown, pending_feeds, stage)
+            saved_total += saved
+            if saved:
+                yield {"type": "saved", "count": saved, "total": saved_total}
+
+    saved, pending, unknown, pending_feeds = _store_batch(db, pending, unknown, pending_feeds, stage)
+    saved_total += saved
+    if saved:
+        yield {"type": "saved", "count": saved, "total": saved_total}
+
+    # 5. Export timings ("process" includes match/dedup/extract)
+    total = time.perf_counter() - scan_start
+    metrics.SCAN_SECONDS.observe(total, mode="unknown" if fetch_unknown else "trusted")
+    for name, seconds in stage.items():
+        metrics.SCAN_STAGE_SECONDS.observe(seconds, stage=name)
+    metrics.SCAN_ENTRIES.inc(processed, outcome="processed")
+    metrics.SCAN_ENTRIES.inc(matched_total, outcome="matched")
+    metrics.SCAN_ENTRIES.inc(saved_total, outcome="saved")
+    logger.info(
+        f"Scan finished in {total:.2f}s: {processed} entries, {matched_total} matched, {saved_total} saved; "
+        + ", ".join(f"{name} {seconds:.3f}s" for name, seconds in stage.items())
+    )
+    if timings is not None:
+        timings.update(
+            total_s=round(total, 6),
+            stages={name: round(seconds, 6) for name, seconds in stage.items()},
+            entries={"processed": processed, "matched": matched_total, "saved": saved_total},
+            feeds=feed_timings
+        )
+
+    yield {"type": "done", "saved_trusted_count": saved_total, "unknown_count": unknown_total}
+
+def _store_batch(db: Session, pending: list, unknown: list, pending_feeds: list, stage: dict):
+    # 3. Save new trusted articles in one transaction (already stored links are skipped)
+    t = time.perf_counter()
+    saved = len(crud.ingest_articles(db, pending)) if pending else 0
+    stage["ingest"] += time.perf_counter() - t
+
+    # 3b. Queue unknown-source articles for review
+    if unknown:
+        t = time.perf_counter()
+        crud.stage_pending_articles(db, unknown)
+        stage["stage_pending"] += time.perf_counter() - t
+
+    # 4. Only remember a feed body once its articles are stored
+    t = time.perf_counter()
+    for result, top_hash, feed_newest in pending_feeds:
+        crud.save_feed_state(
+            db, result.url, result.etag, result.last_modified, result.content_hash,
+            last_entry_hash=top_hash, newest_published=feed_newest
+        )
+    stage["feed_state"] += time.perf_counter() - t
+    return saved, [], [], []
+
+def scan_news(db: Session, fetch_unknown: bool, force: bool = False, on_feed=None,
+              timings: dict | None = None) -> schemas.ScanResult:
+    """
+    Run a whole scan and collect the unknown-source articles (see iter_scan).
+    on_feed(url, status, entries, matched) is called once per feed as it
+    finishes (used by jobs.py to report progress).
+    """
+    unknown_articles = []
+    saved_count = 0
+    for event in iter_scan(db, fetch_unknown, force, timings):
+        if event["type"] == "article" and not event["trusted"]:
+            unknown_articles.append(event["article"])
+        elif event["type"] == "feed" and on_feed:
+            on_feed(event["url"], event["status"], event["entries"], event["matched"])
+        elif event["type"] == "done":
+            saved_count = event["saved_trusted_count"]
 
     return schemas.ScanResult(
         saved_trusted_count=saved_count,
-        unknown_articles=unknown_articles_list
+        unknown_articles=unknown_articles
     )
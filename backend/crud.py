@@ -1,25 +1,124 @@
-from sqlalchemy.orm import Session
-from . import models, schemas
-from datetime import datetime
+from sqlalchemy.orm import Session, contains_eager, load_only
+from sqlalchemy import or_, and_, insert, update, select, bindparam, text, func
+from sqlalchemy.exc import IntegrityError
+from . import models, schemas, matcher, urls, cache, search, metrics, extraction, whitelist
+from datetime import datetime, timezone
 
 # --- Articles ---
 
-def get_articles(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(models.ArticleIdentity).order_by(models.ArticleIdentity.published_date.desc()).offset(skip).limit(limit).all()
+@metrics.timed()
+def get_articles(db: Session, skip: int = 0, limit: int = 100, after: tuple[datetime, int] | None = None,
+                 keyword: str | None = None, tag: str | None = None):
+    # Identity + details in one joined query, loading only the columns ArticleDTO reads
+    # (avoids one lazy load of `details` per row).
+    # `after` = (published_date, id) of the last row of the previous page: keyset
+    # pagination that seeks on the index instead of skipping rows; it overrides skip.
+    query = db.query(models.ArticleIdentity)\
+        .outerjoin(models.ArticleIdentity.details)\
+        .options(
+            load_only(
+                models.ArticleIdentity.id,
+                models.ArticleIdentity.title,
+                models.ArticleIdentity.link,
+                models.ArticleIdentity.published_date
+            ),
+            contains_eager(models.ArticleIdentity.details).load_only(
+                models.ArticleDetails.summary,
+                models.ArticleDetails.source,
+                models.ArticleDetails.keywords_matched,
+                models.ArticleDetails.tags,
+                models.ArticleDetails.is_whitelisted
+            )
+        )\
+        .order_by(models.ArticleIdentity.published_date.desc(), models.ArticleIdentity.id.desc())
+    # Filters seek the (keyword, article_id) / (tag, article_id) indexes
+    if keyword:
+        query = query.filter(models.ArticleIdentity.keyword_rows.any(models.ArticleKeyword.keyword == keyword.strip().lower()))
+    if tag:
+        query = query.filter(models.ArticleIdentity.tag_rows.any(models.ArticleTag.tag == tag.strip()))
+    if after:
+        published_date, article_id = after
+        query = query.filter(or_(
+            models.ArticleIdentity.published_date < published_date,
+            and_(models.ArticleIdentity.published_date == published_date, models.ArticleIdentity.id < article_id)
+        ))
+    else:
+        query = query.offset(skip)
+    return query.limit(limit).all()
+
+def get_articles_by_ids(db: Session, ids: list[int]):
+    # Same joined load as get_articles, in the order of `ids`
+    if not ids:
+        return []
+    rows = db.query(models.ArticleIdentity)\
+        .outerjoin(models.ArticleIdentity.details)\
+        .options(contains_eager(models.ArticleIdentity.details))\
+        .filter(models.ArticleIdentity.id.in_(ids)).all()
+    by_id = {row.id: row for row in rows}
+    return [by_id[i] for i in ids if i in by_id]
 
 def get_article_by_link(db: Session, link: str):
-    return db.query(models.ArticleIdentity).filter(models.ArticleIdentity.link == link).first()
+    # Also catches syndicated / tracked copies of the same canonical URL
+    return db.query(models.ArticleIdentity).filter(
+        or_(models.ArticleIdentity.link == link, models.ArticleIdentity.link_hash == urls.link_hash(link))
+    ).first()
+
+# Keep IN lists well under the 2100 parameter limit of SQL Server
+LOOKUP_CHUNK_SIZE = 500
+
+@metrics.timed()
+def get_existing_link_hashes(db: Session, links: list[str]) -> set[str]:
+    """
+    Batched dedup lookup: returns the canonical link hashes (urls.link_hash)
+    of `links` that are already stored. Rows saved before link_hash existed
+    are matched on the raw link.
+    """
+    links = list(dict.fromkeys(links))
+    existing = set()
+    for i in range(0, len(links), LOOKUP_CHUNK_SIZE):
+        chunk = links[i:i + LOOKUP_CHUNK_SIZE]
+        hashes = [urls.link_hash(link) for link in chunk]
+        rows = db.query(models.ArticleIdentity.link, models.ArticleIdentity.link_hash).filter(
+            or_(models.ArticleIdentity.link_hash.in_(hashes), models.ArticleIdentity.link.in_(chunk))
+        ).all()
+        for row in rows:
+            existing.add(row.link_hash or urls.link_hash(row.link))
+    return existing
+
+def split_terms(value: str | None) -> list[str]:
+    # "Mới, Cảnh báo" -> ["Mới", "Cảnh báo"] (comma-joined tags / keywords_matched)
+    if not value:
+        return []
+    return list(dict.fromkeys(t.strip() for t in value.split(",") if t.strip()))
 
+def article_term_rows(article_id: int, tags: str | None, keywords_matched: str | None) -> tuple[list[dict], list[dict]]:
+    """
+    Rows for the indexed article_tags / article_keywords tables.
+    Keywords are stored lowercased so ?keyword= filters are case-insensitive everywhere.
+    """
+    tag_rows = [{"article_id": article_id, "tag": tag} for tag in split_terms(tags)]
+    keywords = dict.fromkeys(k.lower() for k in split_terms(keywords_matched))
+    keyword_rows = [{"article_id": article_id, "keyword": keyword} for keyword in keywords]
+    return tag_rows, keyword_rows
+
+def insert_article_terms(db: Session, tag_rows: list[dict], keyword_rows: list[dict]):
+    # executemany inserts; caller commits
+    if tag_rows:
+        db.execute(insert(models.ArticleTag), tag_rows)
+    if keyword_rows:
+        db.execute(insert(models.ArticleKeyword), keyword_rows)
+
+@metrics.timed()
 def create_article(db: Session, article: schemas.ArticleCreate):
     # 1. Create Identity
     db_identity = models.ArticleIdentity(
         title=article.title,
         link=article.link,
-        published_date=article.published_date
+        link_hash=urls.link_hash(article.link),
+        published_date=article.published_date or datetime.utcnow()
     )
     db.add(db_identity)
-    db.commit()
-    db.refresh(db_identity)
+    db.flush() # assigns db_identity.id, committed together with the details
 
     # 2. Create Details
     db_details = models.ArticleDetails(
@@ -31,27 +130,584 @@ def create_article(db: Session, article: schemas.ArticleCreate):
         is_whitelisted=article.is_whitelisted
     )
     db.add(db_details)
+
+    # 3. Tag / keyword / search index rows
+    insert_article_terms(db, *article_term_rows(db_identity.id, article.tags, article.keywords_matched))
+    search.index_articles(db, [(db_identity.id, article.title, article.summary)])
     db.commit()
+    cache.stats_cache.invalidate()
     
     return db_identity
 
+def insert_new_identities(db: Session, new_items: list[tuple]) -> list[tuple]:
+    """
+    Insert the identities of (article, cases, link_hash) items inside a
+    savepoint. Another writer (a second worker process, a bulk upsert) may
+    have stored some of the links since the dedup lookup: on a unique
+    violation the lookup runs again and the remaining items are retried.
+    Returns the items actually inserted. Caller commits.
+    """
+    while new_items:
+        try:
+            with db.begin_nested():
+                db.execute(insert(models.ArticleIdentity), [
+                    {
+                        "title": article.title,
+                        "link": article.link,
+                        "link_hash": link_hash,
+                        "published_date": article.published_date or datetime.utcnow()
+                    }
+                    for article, _, link_hash in new_items
+                ])
+            return new_items
+        except IntegrityError:
+            stored = get_existing_link_hashes(db, [article.link for article, _, _ in new_items])
+            remaining = [item for item in new_items if item[2] not in stored]
+            if len(remaining) == len(new_items):
+                raise # not a concurrent insert of the same links
+            new_items = remaining
+    return new_items
+
+@metrics.timed()
+def ingest_articles(db: Session, batch: list[tuple[schemas.ArticleCreate, list[schemas.DiseaseCaseCreate]]],
+                    commit: bool = True) -> dict[str, int]:
+    """
+    Bulk save: writes identities, details and disease cases for the whole
+    batch (plus their tag/keyword/search index rows) in one transaction with
+    multi-row inserts. Articles whose canonical
+    link is already stored (or repeated in the batch) are skipped.
+    commit=False leaves the transaction open for the caller (who then commits
+    and invalidates the stats cache).
+    Returns {link: article_id} of the inserted articles.
+    """
+    if not batch:
+        return {}
+
+    # 1. Drop duplicates (one batched lookup)
+    existing_hashes = get_existing_link_hashes(db, [article.link for article, _ in batch])
+    new_items = []
+    for article, cases in batch:
+        link_hash = urls.link_hash(article.link)
+        if link_hash in existing_hashes:
+            continue
+        existing_hashes.add(link_hash)
+        new_items.append((article, cases, link_hash))
+    if not new_items:
+        return {}
+
+    try:
+        # 2. Identities (executemany), then read the new ids back by link
+        new_items = insert_new_identities(db, new_items)
+        if not new_items:
+            return {}
+        saved = {}
+        new_links = [article.link for article, _, _ in new_items]
+        for i in range(0, len(new_links), LOOKUP_CHUNK_SIZE):
+            rows = db.query(models.ArticleIdentity.id, models.ArticleIdentity.link).filter(
+                models.ArticleIdentity.link.in_(new_links[i:i + LOOKUP_CHUNK_SIZE])
+            ).all()
+            saved.update({row.link: row.id for row in rows})
+
+        # 3. Details (executemany)
+        db.execute(insert(models.ArticleDetails), [
+            {
+                "article_id": saved[article.link],
+                "summary": article.summary,
+                "source": article.source,
+                "keywords_matched": article.keywords_matched,
+                "tags": article.tags,
+                "is_whitelisted": article.is_whitelisted
+            }
+            for article, _, _ in new_items
+        ])
+
+        # 4. Tag / keyword / search index rows (executemany)
+        tag_rows, keyword_rows = [], []
+        for article, _, _ in new_items:
+            tags, keywords = article_term_rows(saved[article.link], article.tags, article.keywords_matched)
+            tag_rows.extend(tags)
+            keyword_rows.extend(keywords)
+        insert_article_terms(db, tag_rows, keyword_rows)
+        search.index_articles(db, [(saved[article.link], article.title, article.summary) for article, _, _ in new_items])
+
+        # 5. Disease cases (executemany)
+        case_rows = [
+            {
+                "article_id": saved[article.link],
+                "disease_name": case.disease_name,
+                "case_count": case.case_count,
+                "location": case.location,
+                "report_date": case.report_date or article.published_date or datetime.utcnow()
+            }
+            for article, cases, _ in new_items
+            for case in cases
+        ]
+        if case_rows:
+            db.execute(insert(models.DiseaseCase), case_rows)
+            add_to_case_rollups(db, case_rows)
+
+        if commit:
+            db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    if commit:
+        cache.stats_cache.invalidate()
+
+    return saved
+
+MSSQL_MAX_PARAMS = 2000 # SQL Server accepts 2100 parameters per statement
+
+def mssql_merge_statements(table_name: str, keys: tuple[str, ...], rows: list[dict],
+                           increment: tuple[str, ...] = ()) -> list[tuple[str, dict]]:
+    # (sql, params) MERGE statements over multi-row VALUES, chunked under MSSQL_MAX_PARAMS
+    columns = list(rows[0])
+    per_statement = max(1, MSSQL_MAX_PARAMS // len(columns))
+    column_list = ", ".join(columns)
+    match = " AND ".join(f"t.{k} = s.{k}" for k in keys)
+    updates = ", ".join(
+        f"t.{c} = t.{c} + s.{c}" if c in increment else f"t.{c} = s.{c}"
+        for c in columns if c not in keys
+    )
+    statements = []
+    for i in range(0, len(rows), per_statement):
+        chunk = rows[i:i + per_statement]
+        values = ", ".join("(" + ", ".join(f":{c}_{n}" for c in columns) + ")" for n in range(len(chunk)))
+        params = {f"{c}_{n}": row[c] for n, row in enumerate(chunk) for c in columns}
+        statements.append((
+            f"MERGE {table_name} WITH (HOLDLOCK) AS t USING (VALUES {values}) AS s ({column_list}) "
+            f"ON {match} "
+            f"WHEN MATCHED THEN UPDATE SET {updates} "
+            f"WHEN NOT MATCHED THEN INSERT ({column_list}) VALUES ({', '.join('s.' + c for c in columns)});",
+            params
+        ))
+    return statements
+
+def upsert_rows(db: Session, model, key: str | tuple[str, ...], rows: list[dict], increment: tuple[str, ...] = ()):
+    """
+    Insert-or-update `rows` on the unique column(s) `key`, set-based:
+    ON CONFLICT DO UPDATE on SQLite/PostgreSQL, MERGE WITH (HOLDLOCK) over
+    multi-row VALUES on SQL Server, UPDATE + INSERT elsewhere. Columns in
+    `increment` are added to the stored value instead of replacing it.
+    Keys must be unique within `rows`. Caller commits.
+    """
+    if not rows:
+        return
+    keys = (key,) if isinstance(key, str) else tuple(key)
+    table = model.__table__
+    columns = list(rows[0])
+    dialect = db.get_bind().dialect.name
+
+    if dialect in ("sqlite", "postgresql"):
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        stmt = dialect_insert(table)
+        stmt = stmt.on_conflict_do_update(index_elements=list(keys), set_={
+            c: table.c[c] + stmt.excluded[c] if c in increment else stmt.excluded[c]
+            for c in columns if c not in keys
+        })
+        db.execute(stmt, rows)
+    elif dialect == "mssql":
+        for sql, params in mssql_merge_statements(table.name, keys, rows, increment):
+            db.execute(text(sql), params)
+    else:
+        # Stored keys among `rows` (seek on the first key column, compare whole keys here)
+        first = [row[keys[0]] for row in rows]
+        existing = set()
+        for i in range(0, len(first), LOOKUP_CHUNK_SIZE):
+            existing.update(tuple(r) for r in db.execute(
+                select(*[table.c[k] for k in keys]).where(table.c[keys[0]].in_(first[i:i + LOOKUP_CHUNK_SIZE]))
+            ))
+        def row_key(row):
+            return tuple(row[k] for k in keys)
+        # Bind names must differ from the column names in UPDATE ... SET
+        updates = [{"_" + c: row[c] for c in columns} for row in rows if row_key(row) in existing]
+        if updates:
+            db.execute(
+                update(table).where(and_(*[table.c[k] == bindparam("_" + k) for k in keys]))
+                .values({
+                    c: table.c[c] + bindparam("_" + c) if c in increment else bindparam("_" + c)
+                    for c in columns if c not in keys
+                }),
+                updates
+            )
+        inserts = [row for row in rows if row_key(row) not in existing]
+        if inserts:
+            db.execute(insert(table), inserts)
+
+def _utc_naive(value: datetime | None) -> datetime | None:
+    # Stored dates are naive UTC (see crawler.parse_date)
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+@metrics.timed()
+def upsert_articles(db: Session, articles: list[schemas.ArticleCreate]) -> list[schemas.BulkArticleStatus]:
+    """
+    Bulk import: inserts new articles and updates stored ones (matched on
+    the canonical link) in one transaction. Articles identical to the
+    stored row, and repeats of a link earlier in the request, are skipped.
+    A missing published_date keeps the stored one.
+    Returns one status per input article, in order.
+    """
+    # 1. Canonical link per item; later repeats are skipped
+    statuses = [None] * len(articles)
+    first_by_hash = {}
+    for i, article in enumerate(articles):
+        link_hash = urls.link_hash(article.link)
+        if link_hash in first_by_hash:
+            statuses[i] = schemas.BulkArticleStatus(link=article.link, status="skipped")
+            continue
+        article = article.model_copy(update={"published_date": _utc_naive(article.published_date)})
+        first_by_hash[link_hash] = (i, article)
+
+    # 2. Stored rows for those links (rows without link_hash match on the raw link)
+    stored = {}
+    items = list(first_by_hash.items())
+    for c in range(0, len(items), LOOKUP_CHUNK_SIZE):
+        chunk = items[c:c + LOOKUP_CHUNK_SIZE]
+        rows = db.query(models.ArticleIdentity)\
+            .outerjoin(models.ArticleIdentity.details)\
+            .options(contains_eager(models.ArticleIdentity.details))\
+            .filter(or_(
+                models.ArticleIdentity.link_hash.in_([link_hash for link_hash, _ in chunk]),
+                models.ArticleIdentity.link.in_([article.link for _, (_, article) in chunk])
+            )).all()
+        for row in rows:
+            stored[row.link_hash or urls.link_hash(row.link)] = row
+
+    fields = ("title", "summary", "source", "keywords_matched", "tags", "is_whitelisted")
+    inserts, changed = [], []
+    for link_hash, (i, article) in first_by_hash.items():
+        row = stored.get(link_hash)
+        if row is None:
+            inserts.append((i, article))
+            continue
+        published_date = article.published_date or row.published_date
+        if published_date == row.published_date and all(getattr(article, f) == getattr(row, f) for f in fields):
+            statuses[i] = schemas.BulkArticleStatus(link=article.link, status="skipped", id=row.id)
+        else:
+            changed.append((i, article, row.id, published_date))
+
+    try:
+        # 3. New articles: same executemany path as the scan
+        saved = ingest_articles(db, [(article, []) for _, article in inserts], commit=False)
+        for i, article in inserts:
+            if article.link in saved:
+                statuses[i] = schemas.BulkArticleStatus(link=article.link, status="inserted", id=saved[article.link])
+            else: # stored by a concurrent writer since the lookup
+                statuses[i] = schemas.BulkArticleStatus(link=article.link, status="skipped")
+
+        # 4. Changed articles: identity by primary key, details / search rows upserted,
+        # tag and keyword rows replaced
+        if changed:
+            db.execute(update(models.ArticleIdentity), [
+                {"id": article_id, "title": article.title, "published_date": published_date}
+                for _, article, article_id, published_date in changed
+            ])
+            upsert_rows(db, models.ArticleDetails, "article_id", [
+                {
+                    "article_id": article_id,
+                    "summary": article.summary,
+                    "source": article.source,
+                    "keywords_matched": article.keywords_matched,
+                    "tags": article.tags,
+                    "is_whitelisted": article.is_whitelisted
+                }
+                for _, article, article_id, _ in changed
+            ])
+            upsert_rows(db, models.ArticleSearch, "article_id", search.search_rows(
+                [(article_id, article.title, article.summary) for _, article, article_id, _ in changed]
+            ))
+            ids = [article_id for _, _, article_id, _ in changed]
+            for c in range(0, len(ids), LOOKUP_CHUNK_SIZE):
+                chunk = ids[c:c + LOOKUP_CHUNK_SIZE]
+                db.query(models.ArticleTag).filter(models.ArticleTag.article_id.in_(chunk)).delete(synchronize_session=False)
+                db.query(models.ArticleKeyword).filter(models.ArticleKeyword.article_id.in_(chunk)).delete(synchronize_session=False)
+            tag_rows, keyword_rows = [], []
+            for i, article, article_id, _ in changed:
+                tags, keywords = article_term_rows(article_id, article.tags, article.keywords_matched)
+                tag_rows.extend(tags)
+                keyword_rows.extend(keywords)
+                statuses[i] = schemas.BulkArticleStatus(link=article.link, status="updated", id=article_id)
+            insert_article_terms(db, tag_rows, keyword_rows)
+
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    if inserts or changed:
+        cache.stats_cache.invalidate()
+    return statuses
+
+# --- Pending (unverified source) articles ---
+
+def get_queued_link_hashes(db: Session, hashes: list[str]) -> set[str]:
+    # Link hashes among `hashes` already in the review queue (any status)
+    queued = set()
+    for i in range(0, len(hashes), LOOKUP_CHUNK_SIZE):
+        rows = db.query(models.PendingArticle.link_hash).filter(
+            models.PendingArticle.link_hash.in_(hashes[i:i + LOOKUP_CHUNK_SIZE])
+        ).all()
+        queued.update(row.link_hash for row in rows)
+    return queued
+
+@metrics.timed()
+def stage_pending_articles(db: Session, articles: list[schemas.ArticleCreate]) -> int:
+    """
+    Upsert unknown-source articles into the review queue in one transaction:
+    new links are inserted, queued ones (pending or rejected) only get
+    last_seen_at bumped, links already stored as articles are skipped.
+    Returns the number of newly queued articles.
+    """
+    by_hash = {}
+    for article in articles:
+        by_hash.setdefault(urls.link_hash(article.link), article)
+    if not by_hash:
+        return 0
+
+    stored = get_existing_link_hashes(db, [article.link for article in by_hash.values()])
+    hashes = [link_hash for link_hash in by_hash if link_hash not in stored]
+    queued = get_queued_link_hashes(db, hashes)
+
+    now = datetime.utcnow()
+    new_rows = [
+        {
+            "link": by_hash[link_hash].link,
+            "link_hash": link_hash,
+            "title": by_hash[link_hash].title,
+            "summary": by_hash[link_hash].summary,
+            "source": by_hash[link_hash].source,
+            "published_date": by_hash[link_hash].published_date or now,
+            "keywords_matched": by_hash[link_hash].keywords_matched,
+            "tags": by_hash[link_hash].tags,
+            "status": "pending",
+            "first_seen_at": now,
+            "last_seen_at": now
+        }
+        for link_hash in hashes if link_hash not in queued
+    ]
+    seen_again = list(queued)
+    try:
+        while new_rows:
+            try:
+                with db.begin_nested():
+                    db.execute(insert(models.PendingArticle), new_rows)
+                break
+            except IntegrityError:
+                # Queued by a concurrent scan since the lookup: bump those instead
+                queued = get_queued_link_hashes(db, [row["link_hash"] for row in new_rows])
+                if not queued:
+                    raise
+                seen_again.extend(queued)
+                new_rows = [row for row in new_rows if row["link_hash"] not in queued]
+        for i in range(0, len(seen_again), LOOKUP_CHUNK_SIZE):
+            db.query(models.PendingArticle)\
+                .filter(models.PendingArticle.link_hash.in_(seen_again[i:i + LOOKUP_CHUNK_SIZE]))\
+                .update({models.PendingArticle.last_seen_at: now}, synchronize_session=False)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return len(new_rows)
+
+def get_pending_articles(db: Session, status: str = "pending", skip: int = 0, limit: int = 100,
+                         after: tuple[datetime, int] | None = None):
+    # Newest first; `after` = (published_date, id) keyset as in get_articles
+    query = db.query(models.PendingArticle)\
+        .filter(models.PendingArticle.status == status)\
+        .order_by(models.PendingArticle.published_date.desc(), models.PendingArticle.id.desc())
+    if after:
+        published_date, pending_id = after
+        query = query.filter(or_(
+            models.PendingArticle.published_date < published_date,
+            and_(models.PendingArticle.published_date == published_date, models.PendingArticle.id < pending_id)
+        ))
+    else:
+        query = query.offset(skip)
+    return query.limit(limit).all()
+
+def find_pending_articles(db: Session, ids: list[int], links: list[str]) -> tuple[list[models.PendingArticle], list[str]]:
+    # Queue rows selected by id or link (any status); also returns the links that are not queued
+    rows = {}
+    ids = list(dict.fromkeys(ids))
+    for i in range(0, len(ids), LOOKUP_CHUNK_SIZE):
+        for row in db.query(models.PendingArticle).filter(models.PendingArticle.id.in_(ids[i:i + LOOKUP_CHUNK_SIZE])):
+            rows[row.id] = row
+    hashes = {urls.link_hash(link): link for link in links}
+    hash_list = list(hashes)
+    found_hashes = set()
+    for i in range(0, len(hash_list), LOOKUP_CHUNK_SIZE):
+        for row in db.query(models.PendingArticle).filter(models.PendingArticle.link_hash.in_(hash_list[i:i + LOOKUP_CHUNK_SIZE])):
+            rows[row.id] = row
+            found_hashes.add(row.link_hash)
+    missing = [link for link_hash, link in hashes.items() if link_hash not in found_hashes]
+    return list(rows.values()), missing
+
+@metrics.timed()
+def approve_pending_articles(db: Session, rows: list[models.PendingArticle], keywords: list[str]) -> dict[str, int]:
+    """
+    Move queue rows into article_identity / article_details with freshly
+    extracted disease cases, and drop them from the queue, in one
+    transaction. Returns {link: article_id} of the inserted articles
+    (rows whose link got stored meanwhile are only dropped).
+    """
+    if not rows:
+        return {}
+    batch = [
+        (
+            schemas.ArticleCreate(
+                title=row.title or "",
+                link=row.link,
+                summary=row.summary,
+                source=row.source,
+                published_date=row.published_date,
+                keywords_matched=row.keywords_matched,
+                tags=row.tags,
+                is_whitelisted=False
+            ),
+            extraction.extract_cases(row.title, row.summary, keywords, row.published_date)
+        )
+        for row in rows
+    ]
+    row_ids = [row.id for row in rows]
+    try:
+        saved = ingest_articles(db, batch, commit=False)
+        for i in range(0, len(row_ids), LOOKUP_CHUNK_SIZE):
+            db.query(models.PendingArticle)\
+                .filter(models.PendingArticle.id.in_(row_ids[i:i + LOOKUP_CHUNK_SIZE]))\
+                .delete(synchronize_session=False)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    cache.stats_cache.invalidate()
+    return saved
+
+def reject_pending_articles(db: Session, rows: list[models.PendingArticle]) -> int:
+    row_ids = [row.id for row in rows]
+    for i in range(0, len(row_ids), LOOKUP_CHUNK_SIZE):
+        db.query(models.PendingArticle)\
+            .filter(models.PendingArticle.id.in_(row_ids[i:i + LOOKUP_CHUNK_SIZE]))\
+            .update({models.PendingArticle.status: "rejected"}, synchronize_session=False)
+    db.commit()
+    return len(row_ids)
+
 # --- Disease Cases ---
 
+@metrics.timed()
 def create_disease_case(db: Session, case: models.DiseaseCase):
+    case.report_date = case.report_date or datetime.utcnow()
     db.add(case)
+    add_to_case_rollups(db, [{
+        "report_date": case.report_date,
+        "disease_name": case.disease_name,
+        "location": case.location,
+        "case_count": case.case_count
+    }])
     db.commit()
+    cache.stats_cache.invalidate()
     db.refresh(case)
     return case
 
+# --- Daily Case Rollups ---
+
+def _rollup_key(row: dict) -> tuple:
+    # NULL disease/location are stored as "" so the unique key stays comparable
+    return (row["report_date"].date(), row["disease_name"] or "", row["location"] or "")
+
+@metrics.timed()
+def add_to_case_rollups(db: Session, case_rows: list[dict]):
+    """
+    Incrementally fold new DiseaseCase rows (dicts with report_date,
+    disease_name, location, case_count) into daily_case_rollups.
+    Runs inside the caller's transaction; caller commits.
+    """
+    totals = {}
+    for row in case_rows:
+        key = _rollup_key(row)
+        case_count, report_count = totals.get(key, (0, 0))
+        totals[key] = (case_count + (row["case_count"] or 0), report_count + 1)
+    if not totals:
+        return
+
+    # Upsert with relative increments: concurrent writers (scan, approval, bulk
+    # import) neither lose increments nor collide on a new (day, disease, location)
+    upsert_rows(db, models.DailyCaseRollup, ("day", "disease_name", "location"), [
+        {
+            "day": day,
+            "disease_name": disease_name,
+            "location": location,
+            "case_count": case_count,
+            "report_count": report_count
+        }
+        for (day, disease_name, location), (case_count, report_count) in totals.items()
+    ], increment=("case_count", "report_count"))
+
+@metrics.timed()
+def rebuild_case_rollups(db: Session, batch_size: int = 5000) -> int:
+    """
+    Recompute daily_case_rollups from disease_cases (e.g. after manual edits).
+    Aggregates in Python so the day bucketing is the same on every backend.
+    Returns the number of rollup rows written.
+    """
+    totals = {}
+    rows = db.query(
+        models.DiseaseCase.report_date, models.DiseaseCase.disease_name,
+        models.DiseaseCase.location, models.DiseaseCase.case_count
+    ).filter(models.DiseaseCase.report_date.isnot(None)).yield_per(batch_size)
+    for row in rows:
+        key = _rollup_key(row._mapping)
+        case_count, report_count = totals.get(key, (0, 0))
+        totals[key] = (case_count + (row.case_count or 0), report_count + 1)
+
+    try:
+        db.query(models.DailyCaseRollup).delete(synchronize_session=False)
+        if totals:
+            db.execute(insert(models.DailyCaseRollup), [
+                {
+                    "day": day,
+                    "disease_name": disease_name,
+                    "location": location,
+                    "case_count": case_count,
+                    "report_count": report_count
+                }
+                for (day, disease_name, location), (case_count, report_count) in totals.items()
+            ])
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    cache.stats_cache.invalidate()
+    return len(totals)
+
 # --- Whitelist ---
 
-def get_whitelisted_domains(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(models.WhitelistDomain).order_by(models.WhitelistDomain.id).offset(skip).limit(limit).all()
+def get_whitelisted_domains(db: Session, skip: int = 0, limit: int = 100, after_id: int | None = None):
+    query = db.query(models.WhitelistDomain).order_by(models.WhitelistDomain.id)
+    if after_id is not None:
+        query = query.filter(models.WhitelistDomain.id > after_id)
+    else:
+        query = query.offset(skip)
+    return query.limit(limit).all()
+
+def get_active_whitelist_domains(db: Session) -> list[str]:
+    # Every active row (no paging): the scan's trust check needs the whole list
+    return [row.domain for row in db.query(models.WhitelistDomain.domain).filter(models.WhitelistDomain.is_active == True)]
+
+def get_whitelist_signature(db: Session) -> tuple:
+    # (count, max id) of the active rows: changes whenever a domain is added or (de)activated
+    return tuple(db.query(func.count(models.WhitelistDomain.id), func.max(models.WhitelistDomain.id))
+                 .filter(models.WhitelistDomain.is_active == True).one())
 
 def create_whitelist_domain(db: Session, domain: schemas.WhitelistCreate):
     db_domain = models.WhitelistDomain(domain=domain.domain, is_active=domain.is_active)
     db.add(db_domain)
+    reset_feed_states(db)
     db.commit()
+    whitelist.invalidate()
     db.refresh(db_domain)
     return db_domain
 
@@ -60,14 +716,21 @@ def get_whitelist_by_name(db: Session, domain: str):
 
 # --- Keywords ---
 
-def get_keywords(db: Session, skip: int = 0, limit: int = 100):
+def get_keywords(db: Session, skip: int = 0, limit: int = 100, after_id: int | None = None):
     # Sort by ID descending to show newest first (Recent)
-    return db.query(models.Keyword).order_by(models.Keyword.id.desc()).offset(skip).limit(limit).all()
+    query = db.query(models.Keyword).order_by(models.Keyword.id.desc())
+    if after_id is not None:
+        query = query.filter(models.Keyword.id < after_id)
+    else:
+        query = query.offset(skip)
+    return query.limit(limit).all()
 
 def create_keyword(db: Session, keyword: schemas.KeywordCreate):
     db_keyword = models.Keyword(text=keyword.text)
     db.add(db_keyword)
+    reset_feed_states(db)
     db.commit()
+    matcher.invalidate()
     db.refresh(db_keyword)
     return db_keyword
 
@@ -75,7 +738,9 @@ def delete_keyword(db: Session, keyword_id: int):
     db_keyword = db.query(models.Keyword).filter(models.Keyword.id == keyword_id).first()
     if db_keyword:
         db.delete(db_keyword)
+        reset_feed_states(db)
         db.commit()
+        matcher.invalidate()
         return True
     return False
 
@@ -86,3 +751,46 @@ def add_keyword(db: Session, text: str):
     existing = get_keyword_by_text(db, text)
     if not existing:
         create_keyword(db, schemas.KeywordCreate(text=text))
+
+# --- Feed Cache ---
+
+@metrics.timed()
+def get_feed_states(db: Session, urls: list[str]):
+    return db.query(models.FeedState).filter(models.FeedState.url.in_(urls)).all()
+
+@metrics.timed()
+def save_feed_state(db: Session, url: str, etag: str | None, last_modified: str | None, content_hash: str | None,
+                    last_entry_hash: str | None = None, newest_published: datetime | None = None):
+    for attempt in range(2):
+        db_state = db.query(models.FeedState).filter(models.FeedState.url == url).first()
+        if not db_state:
+            db_state = models.FeedState(url=url)
+            db.add(db_state)
+        db_state.etag = etag
+        db_state.last_modified = last_modified
+        db_state.content_hash = content_hash
+        # Watermarks only move when the feed body was processed
+        if last_entry_hash:
+            db_state.last_entry_hash = last_entry_hash
+        if newest_published:
+            db_state.newest_published = newest_published
+        db_state.checked_at = datetime.utcnow()
+        try:
+            db.commit()
+            return db_state
+        except IntegrityError:
+            # First state of this feed written by a concurrent scan: update that row
+            db.rollback()
+            if attempt:
+                raise
+
+def reset_feed_states(db: Session):
+    # Keywords/whitelist changed: cached feeds and already seen entries
+    # must be re-matched on the next scan. Caller commits.
+    db.query(models.FeedState).update({
+        models.FeedState.etag: None,
+        models.FeedState.last_modified: None,
+        models.FeedState.content_hash: None,
+        models.FeedState.last_entry_hash: None,
+        models.FeedState.newest_published: None
+    }, synchronize_session=False)
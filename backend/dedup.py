@@ -0,0 +1,51 @@
+from collections import defaultdict
+from rapidfuzz import fuzz, process
+
+class NearDuplicateIndex:
+    """
+    Near-duplicate title detector with the same semantics as
+    `any(fuzz.ratio(title, seen) >= threshold for seen in titles)`.
+
+    fuzz.ratio = 100 * (1 - indel_distance / (len_a + len_b)), and the indel
+    distance is at least |len_a - len_b|, so a title can only reach the
+    threshold against titles whose length lies in a narrow window. Titles are
+    bucketed by length and each bucket in the window is scored in one batched
+    rapidfuzz.process call (C loop with score_cutoff early exit).
+    """
+
+    def __init__(self, threshold: float = 95):
+        self.threshold = threshold
+        self._buckets = defaultdict(list) # length -> titles
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def _length_window(self, length: int) -> range:
+        # |a - b| <= (1 - t) * (a + b)  <=>  a * t / (2 - t) <= b <= a * (2 - t) / t
+        t = self.threshold / 100
+        if t <= 0:
+            return range(0, max(self._buckets, default=0) + 1)
+        low = int(length * t / (2 - t))
+        high = int(length * (2 - t) / t) + 1
+        return range(low, high + 1)
+
+    def is_duplicate(self, title: str) -> bool:
+        for length in self._length_window(len(title)):
+            bucket = self._buckets.get(length)
+            if bucket and process.extractOne(title, bucket, scorer=fuzz.ratio, score_cutoff=self.threshold):
+                return True
+        return False
+
+    def add(self, title: str):
+        self._buckets[len(title)].append(title)
+        self._count += 1
+
+    def add_if_new(self, title: str) -> bool:
+        """
+        Returns False (and does not store it) when `title` is a near duplicate.
+        """
+        if self.is_duplicate(title):
+            return False
+        self.add(title)
+        return True
@@ -0,0 +1,295 @@
+import re
+import threading
+import unicodedata
+from bisect import bisect_right
+from datetime import datetime
+from typing import NamedTuple
+from . import schemas
+from .matcher import Automaton
+
+# Case report extraction: (disease, count, location) triples from an article's
+# title + summary. Disease names (the monitored keywords) and the Vietnamese
+# gazetteer below share one Aho-Corasick trie, counts come from one precompiled
+# regex; each count is paired with the nearest disease and location mention,
+# preferring mentions in the same sentence.
+
+DEFAULT_LOCATION = "Việt Nam" # no province/district mentioned
+
+# Canonical province name -> extra aliases (the canonical name itself is always matched)
+PROVINCES = {
+    "Hà Nội": ["tp hà nội", "thủ đô hà nội"],
+    "TP. Hồ Chí Minh": ["tp.hcm", "tp. hcm", "tp hcm", "tphcm", "tp.hồ chí minh", "thành phố hồ chí minh",
+                        "hồ chí minh", "sài gòn"],
+    "Hải Phòng": [],
+    "Đà Nẵng": [],
+    "Cần Thơ": [],
+    "An Giang": [],
+    "Bà Rịa - Vũng Tàu": ["bà rịa vũng tàu", "bà rịa-vũng tàu", "vũng tàu", "brvt"],
+    "Bắc Giang": [],
+    "Bắc Kạn": ["bắc cạn"],
+    "Bạc Liêu": [],
+    "Bắc Ninh": [],
+    "Bến Tre": [],
+    "Bình Định": ["quy nhơn"],
+    "Bình Dương": [],
+    "Bình Phước": [],
+    "Bình Thuận": ["phan thiết"],
+    "Cà Mau": [],
+    "Cao Bằng": [],
+    "Đắk Lắk": ["đắc lắc", "đăk lăk", "đắk lăk", "buôn ma thuột"],
+    "Đắk Nông": ["đăk nông"],
+    "Điện Biên": [],
+    "Đồng Nai": ["biên hòa"],
+    "Đồng Tháp": [],
+    "Gia Lai": ["pleiku"],
+    "Hà Giang": [],
+    "Hà Nam": [],
+    "Hà Tĩnh": [],
+    "Hải Dương": [],
+    "Hậu Giang": [],
+    "Hòa Bình": [], # also "peace": only matched as "tỉnh Hòa Bình" (see AMBIGUOUS)
+    "Hưng Yên": [],
+    "Khánh Hòa": ["nha trang"],
+    "Kiên Giang": ["phú quốc"],
+    "Kon Tum": [],
+    "Lai Châu": [],
+    "Lâm Đồng": ["đà lạt"],
+    "Lạng Sơn": [],
+    "Lào Cai": ["sa pa", "sapa"],
+    "Long An": [],
+    "Nam Định": [],
+    "Nghệ An": [],
+    "Ninh Bình": [],
+    "Ninh Thuận": [],
+    "Phú Thọ": [],
+    "Phú Yên": [],
+    "Quảng Bình": [],
+    "Quảng Nam": ["hội an"],
+    "Quảng Ngãi": [],
+    "Quảng Ninh": ["hạ long"],
+    "Quảng Trị": [],
+    "Sóc Trăng": [],
+    "Sơn La": [],
+    "Tây Ninh": [],
+    "Thái Bình": [],
+    "Thái Nguyên": [],
+    "Thanh Hóa": [],
+    "Thừa Thiên Huế": ["thừa thiên - huế", "huế"],
+    "Tiền Giang": ["mỹ tho"],
+    "Trà Vinh": [],
+    "Tuyên Quang": [],
+    "Vĩnh Long": [],
+    "Vĩnh Phúc": [],
+    "Yên Bái": [],
+}
+
+# Province -> district level names resolved to that province
+DISTRICTS = {
+    "Hà Nội": ["ba đình", "hoàn kiếm", "hai bà trưng", "đống đa", "cầu giấy", "thanh xuân", "hoàng mai",
+               "long biên", "tây hồ", "nam từ liêm", "bắc từ liêm", "hà đông", "sơn tây", "sóc sơn",
+               "đông anh", "gia lâm", "thanh trì", "mê linh", "chương mỹ", "thạch thất", "ba vì",
+               "đan phượng", "hoài đức", "quốc oai", "thường tín", "phú xuyên", "ứng hòa", "mỹ đức"],
+    "TP. Hồ Chí Minh": [f"quận {n}" for n in (1, 3, 4, 5, 6, 7, 8, 10, 11, 12)] + [
+               "thủ đức", "bình thạnh", "gò vấp", "tân bình", "tân phú", "phú nhuận", "bình tân",
+               "củ chi", "hóc môn", "bình chánh", "nhà bè", "cần giờ"],
+    "Đà Nẵng": ["hải châu", "thanh khê", "sơn trà", "ngũ hành sơn", "liên chiểu", "cẩm lệ", "hòa vang"],
+    "Hải Phòng": ["hồng bàng", "lê chân", "ngô quyền", "kiến an", "hải an", "đồ sơn", "thủy nguyên", "cát hải"],
+    "Cần Thơ": ["ninh kiều", "bình thủy", "cái răng", "ô môn", "thốt nốt"],
+}
+
+# Country-wide statements ("cả nước ghi nhận ...")
+NATIONAL = ["việt nam", "cả nước", "toàn quốc"]
+
+# Names that are also common words: only matched after an administrative prefix
+AMBIGUOUS = {"hòa bình"}
+ADMIN_PREFIXES = ("tỉnh", "thành phố", "tp.", "tp")
+
+# --- Counts ---
+
+DIGITS = {"một": 1, "mốt": 1, "hai": 2, "ba": 3, "bốn": 4, "tư": 4, "năm": 5, "lăm": 5,
+          "sáu": 6, "bảy": 7, "bẩy": 7, "tám": 8, "chín": 9}
+MULTIPLIERS = {"chục": 10, "trăm": 100, "nghìn": 1000, "ngàn": 1000, "vạn": 10000, "triệu": 1000000}
+# Vague quantities ("hàng chục ca") are recorded at their lower bound
+APPROXIMATE = {"hàng": 1, "vài": 2, "mấy": 2, "dăm": 5}
+
+_number_word = "|".join(sorted([*DIGITS, "mười", "mươi", "linh", "lẻ", "trăm", "nghìn", "ngàn"], key=len, reverse=True))
+_multiplier = "|".join(sorted(MULTIPLIERS, key=len, reverse=True))
+NUMBER_PATTERN = (
+    rf"(?P<digits>\d+(?:[.,]\d+)*)(?:\s+(?P<mult>{_multiplier}))?"
+    rf"|(?P<approx>{'|'.join(APPROXIMATE)})\s+(?P<approx_mult>{_multiplier})"
+    rf"|(?P<words>(?:{_number_word})(?:\s+(?:{_number_word}))*)"
+)
+# Unit words that make a number a case count; deaths are not case counts
+UNIT_PATTERN = (
+    r"ca(?:\s+(?:mắc|bệnh|nhiễm|dương\s+tính))?|trường\s+hợp|bệnh\s+nhân"
+    r"|(?:người|trẻ|bé)\s+(?:mắc|nhiễm|bệnh|bị|dương\s+tính)"
+)
+COUNT_RE = re.compile(
+    rf"(?<!\w)(?:{NUMBER_PATTERN})\s+(?:{UNIT_PATTERN})(?!\w)(?!\s+tử\s+vong)"
+)
+# Sentence boundaries: a period only ends a sentence when followed by a space ("1.200", "TP.HCM")
+SENTENCE_END_RE = re.compile(r"[!?;\n]|\.(?=\s)")
+
+class CaseMention(NamedTuple):
+    disease: str
+    count: int
+    location: str
+
+def parse_number_words(words: list[str]) -> int:
+    # "hai trăm ba mươi lăm" -> 235, "mười hai" -> 12, "ba nghìn" -> 3000
+    total = hundreds = current = 0
+    for word in words:
+        if word in ("nghìn", "ngàn"):
+            total += (hundreds + current or 1) * 1000
+            hundreds = current = 0
+        elif word == "trăm":
+            hundreds += (current or 1) * 100
+            current = 0
+        elif word == "mươi":
+            current = (current or 1) * 10
+        elif word == "mười":
+            current += 10
+        elif word in DIGITS:
+            current += DIGITS[word]
+    return total + hundreds + current
+
+def parse_count(match: re.Match) -> int:
+    if match.group("digits"):
+        digits = match.group("digits")
+        if match.group("mult"):
+            # "1,5 nghìn": the separator is a decimal point
+            return int(float(digits.replace(",", ".")) * MULTIPLIERS[match.group("mult")])
+        # "1.200" / "1,200": thousands separators
+        return int(re.sub(r"[.,]", "", digits))
+    if match.group("approx"):
+        return APPROXIMATE[match.group("approx")] * MULTIPLIERS[match.group("approx_mult")]
+    return parse_number_words(match.group("words").split())
+
+def tone_variants(name: str) -> set[str]:
+    # Old and new tone mark placement are both common: "hoà" / "hòa", "thuỷ" / "thủy"
+    variants = {name}
+    for old, new in (("oà", "òa"), ("oá", "óa"), ("oả", "ỏa"), ("oã", "õa"), ("oạ", "ọa"),
+                     ("uỳ", "ùy"), ("uý", "úy"), ("uỷ", "ủy"), ("uỹ", "ũy"), ("uỵ", "ụy")):
+        for variant in list(variants):
+            variants.add(variant.replace(old, new))
+            variants.add(variant.replace(new, old))
+    return variants
+
+def normalize(text: str) -> str:
+    # Feeds mix precomposed and combining diacritics
+    return unicodedata.normalize("NFC", text).lower()
+
+def gazetteer_entries():
+    # (lowercase name, canonical province)
+    for province, aliases in PROVINCES.items():
+        for name in [province.lower(), *aliases]:
+            if name in AMBIGUOUS:
+                for prefix in ADMIN_PREFIXES:
+                    yield f"{prefix} {name}", province
+            else:
+                yield name, province
+    for province, districts in DISTRICTS.items():
+        for name in districts:
+            yield name, province
+    for name in NATIONAL:
+        yield name, DEFAULT_LOCATION
+
+class CaseExtractor:
+    """
+    Compiled extraction engine for one disease list; build once via
+    get_case_extractor() and reuse across articles.
+    """
+
+    def __init__(self, diseases: list[str]):
+        self.diseases = tuple(diseases)
+        self._trie = Automaton()
+        for disease in self.diseases:
+            if disease.strip():
+                for name in tone_variants(normalize(disease)):
+                    self._trie.add(name, ("disease", disease))
+        for name, province in gazetteer_entries():
+            for variant in tone_variants(normalize(name)):
+                self._trie.add(variant, ("location", province))
+        self._trie.build()
+
+    def _mentions(self, text: str):
+        # Longest whole-word mentions, non-overlapping: [(start, end, kind, value)]
+        found = []
+        for start, end, (kind, value) in self._trie.finditer(text):
+            if (start > 0 and text[start - 1].isalnum()) or (end < len(text) and text[end].isalnum()):
+                continue
+            found.append((start, end, kind, value))
+        found.sort(key=lambda m: (m[0], m[0] - m[1]))
+        mentions = []
+        last_end = -1
+        for mention in found:
+            if mention[0] >= last_end:
+                mentions.append(mention)
+                last_end = mention[1]
+        return mentions
+
+    def extract(self, text: str) -> list[CaseMention]:
+        """
+        Every (disease, count, location) reported in `text`, in order of
+        appearance. A disease/location pair is reported once (first count wins:
+        the title usually repeats in the summary). Counts with no disease
+        mention anywhere in the text are dropped.
+        """
+        if not text:
+            return []
+        text = normalize(text)
+        counts = [(m.start(), m.end(), parse_count(m)) for m in COUNT_RE.finditer(text)]
+        if not counts:
+            return []
+
+        mentions = self._mentions(text)
+        diseases = [(start, end, value) for start, end, kind, value in mentions if kind == "disease"]
+        locations = [(start, end, value) for start, end, kind, value in mentions if kind == "location"]
+        if not diseases:
+            return []
+        sentence_ends = [m.end() for m in SENTENCE_END_RE.finditer(text)]
+
+        def nearest(candidates, start, end):
+            # Same sentence first, then by character distance
+            sentence = bisect_right(sentence_ends, start)
+            return min(
+                candidates,
+                key=lambda c: (bisect_right(sentence_ends, c[0]) != sentence, max(c[0] - end, start - c[1], 0))
+            )[2]
+
+        results = []
+        seen = set()
+        for start, end, count in counts:
+            if count <= 0:
+                continue
+            disease = nearest(diseases, start, end)
+            location = nearest(locations, start, end) if locations else DEFAULT_LOCATION
+            if (disease, location) in seen:
+                continue
+            seen.add((disease, location))
+            results.append(CaseMention(disease, count, location))
+        return results
+
+# --- Shared instance ---
+
+_lock = threading.Lock()
+_extractor: CaseExtractor | None = None
+
+def get_case_extractor(diseases: list[str]) -> CaseExtractor:
+    # Rebuilt only when the disease (keyword) list changes
+    global _extractor
+    extractor = _extractor
+    if extractor is not None and extractor.diseases == tuple(diseases):
+        return extractor
+    with _lock:
+        if _extractor is None or _extractor.diseases != tuple(diseases):
+            _extractor = CaseExtractor(diseases)
+        return _extractor
+
+def extract_cases(title: str, summary: str | None, keywords: list[str], report_date: datetime) -> list[schemas.DiseaseCaseCreate]:
+    # One DiseaseCase row per (disease, location) reported in the article
+    extractor = get_case_extractor(keywords)
+    return [
+        schemas.DiseaseCaseCreate(disease_name=m.disease, case_count=m.count, location=m.location, report_date=report_date)
+        for m in extractor.extract((title or "") + "\n" + (summary or ""))
+    ]
@@ -0,0 +1,102 @@
+import feedparser
+import requests
+import hashlib
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import NamedTuple, Optional
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+# Fetch settings (override via environment)
+FETCH_WORKERS = int(os.getenv("FEED_FETCH_WORKERS", "16"))
+FETCH_CONNECT_TIMEOUT = float(os.getenv("FEED_CONNECT_TIMEOUT", "5"))
+FETCH_READ_TIMEOUT = float(os.getenv("FEED_READ_TIMEOUT", "15"))
+
+USER_AGENT = "EpiScout/1.0 (+RSS monitor)"
+
+class FeedResult(NamedTuple):
+    url: str
+    feed: Optional[feedparser.FeedParserDict] # None when skipped or failed
+    status: str # "ok", "not_modified", "unchanged" or "error"
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    content_hash: Optional[str] = None
+    fetch_seconds: float = 0.0 # request + body download
+    parse_seconds: float = 0.0 # feedparser
+
+def fetch_feed(url: str, validators: Optional[dict] = None) -> FeedResult:
+    """
+    Download one feed with connect/read timeouts and parse it.
+    `validators` holds the cached etag / last_modified / content_hash of the
+    previous download; they turn the request into a conditional GET and let
+    us skip parsing when the body did not change.
+    """
+    validators = validators or {}
+    headers = {"User-Agent": USER_AGENT}
+    if validators.get("etag"):
+        headers["If-None-Match"] = validators["etag"]
+    if validators.get("last_modified"):
+        headers["If-Modified-Since"] = validators["last_modified"]
+
+    start = time.perf_counter()
+    try:
+        response = requests.get(
+            url,
+            headers=headers,
+            timeout=(FETCH_CONNECT_TIMEOUT, FETCH_READ_TIMEOUT)
+        )
+    except Exception:
+        metrics.FEED_FETCH_SECONDS.observe(time.perf_counter() - start, feed=url, status="error")
+        raise
+    fetch_seconds = time.perf_counter() - start
+    metrics.FEED_FETCH_SECONDS.observe(fetch_seconds, feed=url, status=response.status_code)
+
+    # 1. Server says nothing changed
+    if response.status_code == 304:
+        return FeedResult(
+            url, None, "not_modified",
+            response.headers.get("ETag") or validators.get("etag"),
+            response.headers.get("Last-Modified") or validators.get("last_modified"),
+            validators.get("content_hash"),
+            fetch_seconds
+        )
+
+    response.raise_for_status()
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+    content_hash = hashlib.sha256(response.content).hexdigest()
+
+    # 2. Server ignored the validators but sent the same body
+    if content_hash == validators.get("content_hash"):
+        return FeedResult(url, None, "unchanged", etag, last_modified, content_hash, fetch_seconds)
+
+    start = time.perf_counter()
+    # Headers too: Content-Type charset and Content-Location base URL, as feedparser.parse(url) applied
+    feed = feedparser.parse(response.content, response_headers=dict(response.headers))
+    parse_seconds = time.perf_counter() - start
+    metrics.FEED_PARSE_SECONDS.observe(parse_seconds, feed=url)
+    return FeedResult(url, feed, "ok", etag, last_modified, content_hash, fetch_seconds, parse_seconds)
+
+def fetch_feeds(urls: list[str], cache: Optional[dict] = None):
+    """
+    Fetch all feeds in parallel with a bounded worker pool.
+    `cache` maps feed url -> validators dict (see fetch_feed).
+    Yields a FeedResult as each download finishes.
+    """
+    if not urls:
+        return
+
+    cache = cache or {}
+    workers = max(1, min(FETCH_WORKERS, len(urls)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(fetch_feed, url, cache.get(url)): url for url in urls}
+        for future in as_completed(futures):
+            url = futures[future]
+            try:
+                yield future.result()
+            except Exception as e:
+                logger.error(f"Error fetching feed {url}: {e}")
+                yield FeedResult(url, None, "error")
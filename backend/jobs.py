@@ -0,0 +1,226 @@
+import cProfile
+import json
+import logging
+import os
+import threading
+import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from . import crawler, database, metrics, schemas
+
+logger = logging.getLogger(__name__)
+
+# Background scan settings (override via environment)
+MAX_FINISHED_JOBS = int(os.getenv("SCAN_JOBS_KEPT", "50"))
+# Directory for per-scan dumps: scan-<id>.prof (cProfile, open with pstats/snakeviz)
+# and scan-<id>.json (stage/feed timings). Unset = no profiling.
+SCAN_PROFILE_DIR = os.getenv("SCAN_PROFILE_DIR")
+
+# Seconds a stream waits for the next event before sending a keep-alive
+STREAM_KEEPALIVE_SECONDS = float(os.getenv("SCAN_STREAM_KEEPALIVE", "15"))
+# Events a stream buffers before dropping the oldest (the client then gets a "lagged" event)
+STREAM_BUFFER_EVENTS = int(os.getenv("SCAN_STREAM_BUFFER", "1000"))
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="scan") # one scan at a time, see start_scan
+_lock = threading.Lock()
+_changed = threading.Condition(_lock) # notified when a job gets an event or finishes
+_jobs: "OrderedDict[str, schemas.ScanJobDTO]" = OrderedDict()
+_subscribers: dict[str, list["Subscription"]] = {} # job id -> streams waiting for its events
+_in_flight: str | None = None # id of the pending/running scan
+_queued: str | None = None # id of the follow-up scan, started when the in-flight one finishes
+
+class Subscription:
+    """Bounded queue of one stream's pending events (see start_scan / iter_events)."""
+    def __init__(self):
+        self.job_id: str | None = None
+        self.events: deque[dict] = deque(maxlen=STREAM_BUFFER_EVENTS)
+        self.dropped = 0
+
+def start_scan(fetch_unknown: bool, force: bool = False, subscription: Subscription | None = None) -> schemas.ScanJobDTO:
+    """
+    Queue a scan and return its job right away.
+    Only one scan runs at a time, whatever its mode, so two crawls never
+    store the same links concurrently. A request joins the in-flight job
+    while that one is still pending (its fetch_unknown / force flags are
+    ORed in) or is running with the same or stronger flags; otherwise it
+    is merged into a single follow-up job started when the running one ends.
+    A subscription passed in receives every event published from now on.
+    """
+    global _in_flight, _queued
+    submit = False
+    with _lock:
+        current = _jobs[_in_flight] if _in_flight else None
+        if current is None:
+            job = _new_job()
+            _in_flight = job.id
+            submit = True
+        elif current.status == "pending" or (
+                current.status == "running" and current.fetch_unknown >= fetch_unknown and current.force >= force):
+            job = current
+        else:
+            job = _jobs[_queued] if _queued else _new_job()
+            _queued = job.id
+        # Flags only change on a job that has not started yet
+        job.fetch_unknown = job.fetch_unknown or fetch_unknown
+        job.force = job.force or force
+        _subscribe(job.id, subscription)
+        _prune()
+        snapshot = job.model_copy(deep=True)
+
+    if submit:
+        _executor.submit(_run, job.id)
+    return snapshot
+
+def _new_job() -> schemas.ScanJobDTO:
+    # Caller holds _lock
+    job = schemas.ScanJobDTO(
+        id=uuid.uuid4().hex,
+        status="pending",
+        created_at=datetime.utcnow(),
+        feeds=[schemas.FeedProgress(url=url) for url in crawler.RSS_FEEDS]
+    )
+    _jobs[job.id] = job
+    return job
+
+def get_job(job_id: str) -> schemas.ScanJobDTO | None:
+    with _lock:
+        job = _jobs.get(job_id)
+        return job.model_copy(deep=True) if job else None
+
+def iter_events(subscription: Subscription):
+    """
+    Yield the subscribed job's scan events as they are published, until the
+    job finishes (a failed job ends with an {"type": "error"} event). Yields
+    None after STREAM_KEEPALIVE_SECONDS without news, so the caller can keep
+    its connection alive. A consumer too slow to keep up loses the oldest
+    events and gets {"type": "lagged", "missed"} in their place.
+    """
+    try:
+        while True:
+            with _changed:
+                job = _jobs.get(subscription.job_id)
+                if job is None:
+                    return
+                if not subscription.events and job.status not in ("done", "failed"):
+                    _changed.wait(STREAM_KEEPALIVE_SECONDS)
+                new = list(subscription.events)
+                subscription.events.clear()
+                missed, subscription.dropped = subscription.dropped, 0
+                finished = job.status in ("done", "failed")
+                error = job.error
+            if missed:
+                yield {"type": "lagged", "missed": missed}
+            if new:
+                yield from new
+            elif finished:
+                if error:
+                    yield {"type": "error", "error": error}
+                return
+            else:
+                yield None
+    finally:
+        with _lock:
+            subscribers = _subscribers.get(subscription.job_id, [])
+            if subscription in subscribers:
+                subscribers.remove(subscription)
+            if not subscribers:
+                _subscribers.pop(subscription.job_id, None)
+
+def _subscribe(job_id: str, subscription: Subscription | None):
+    # Caller holds _lock
+    if subscription:
+        subscription.job_id = job_id
+        _subscribers.setdefault(job_id, []).append(subscription)
+
+def _publish(job_id: str, event: dict):
+    # Events only live in the queues of current subscribers, never on the job
+    with _changed:
+        subscribers = _subscribers.get(job_id)
+        if not subscribers:
+            return
+        if "article" in event:
+            event = {**event, "article": event["article"].model_dump(mode="json")}
+        for subscription in subscribers:
+            if len(subscription.events) == subscription.events.maxlen:
+                subscription.dropped += 1
+            subscription.events.append(event)
+        _changed.notify_all()
+
+def _prune():
+    # Forget the oldest finished jobs (caller holds _lock)
+    finished = [job_id for job_id, job in _jobs.items() if job.status in ("done", "failed")]
+    for job_id in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+        del _jobs[job_id]
+        _subscribers.pop(job_id, None)
+
+def _feed_done(job_id: str, url: str, status: str, entries: int, matched: int):
+    with _lock:
+        job = _jobs[job_id]
+        for feed in job.feeds:
+            if feed.url == url:
+                feed.status = status
+                feed.entries = entries
+                feed.matched = matched
+        job.feeds_done = sum(1 for feed in job.feeds if feed.status != "pending")
+
+def _run(job_id: str):
+    global _in_flight, _queued
+    with _lock:
+        job = _jobs[job_id]
+        job.status = "running"
+        fetch_unknown, force = job.fetch_unknown, job.force
+
+    db = database.SessionLocal()
+    profiler = cProfile.Profile() if SCAN_PROFILE_DIR else None
+    timings = {}
+    saved_count = unknown_count = 0
+    try:
+        if profiler:
+            profiler.enable()
+        try:
+            # Same loop as crawler.scan_news, also publishing every event for the streams
+            for event in crawler.iter_scan(db, fetch_unknown, force, timings):
+                if event["type"] == "feed":
+                    _feed_done(job_id, event["url"], event["status"], event["entries"], event["matched"])
+                elif event["type"] == "done":
+                    saved_count, unknown_count = event["saved_trusted_count"], event["unknown_count"]
+                _publish(job_id, event)
+        finally:
+            if profiler:
+                profiler.disable()
+                _dump_profile(job_id, profiler, timings)
+        metrics.SCANS.inc(status="done")
+        with _lock:
+            job = _jobs[job_id]
+            job.saved_trusted_count = saved_count
+            job.unknown_count = unknown_count
+            job.status = "done"
+    except Exception as e:
+        logger.exception(f"Scan job {job_id} failed")
+        metrics.SCANS.inc(status="failed")
+        with _lock:
+            job = _jobs[job_id]
+            job.status = "failed"
+            job.error = str(e)
+    finally:
+        db.close()
+        next_id = None
+        with _changed:
+            _jobs[job_id].finished_at = datetime.utcnow()
+            if _in_flight == job_id:
+                _in_flight = next_id = _queued
+                _queued = None
+            _changed.notify_all()
+        if next_id:
+            _executor.submit(_run, next_id)
+
+def _dump_profile(job_id: str, profiler: cProfile.Profile, timings: dict):
+    try:
+        os.makedirs(SCAN_PROFILE_DIR, exist_ok=True)
+        profiler.dump_stats(os.path.join(SCAN_PROFILE_DIR, f"scan-{job_id}.prof"))
+        with open(os.path.join(SCAN_PROFILE_DIR, f"scan-{job_id}.json"), "w", encoding="utf-8") as f:
+            json.dump(timings, f, indent=2)
+        logger.info(f"Scan profile written to {SCAN_PROFILE_DIR}/scan-{job_id}.*")
+    except OSError as e:
+        logger.warning(f"Could not write scan profile: {e}")
@@ -1,12 +1,29 @@
-from fastapi import FastAPI, Depends, HTTPException, Query
+import json
+import time
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Depends, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from . import models, database, crawler, crud, schemas, stats
+from . import models, database, crud, schemas, stats, jobs, pagination, cache, search, metrics
 
-models.Base.metadata.create_all(bind=database.engine)
+# Importing this module does not touch the database. Missing tables and the
+# full-text index are created when the app starts (DB_CREATE_SCHEMA=false to
+# skip, e.g. when `python -m backend.migrate` runs as a deploy step).
+DB_CREATE_SCHEMA = database.env_bool("DB_CREATE_SCHEMA", True)
 
-app = FastAPI()
+def create_schema(engine):
+    models.Base.metadata.create_all(bind=engine)
+    search.ensure_index(engine)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if DB_CREATE_SCHEMA:
+        create_schema(database.engine)
+    yield
+
+app = FastAPI(lifespan=lifespan)
 
 # CORS configuration
 origins = [
@@ -22,8 +39,51 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
+@app.middleware("http")
+async def record_request_latency(request: Request, call_next):
+    # Labelled by route template (/api/scan/{job_id}), not the raw path
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        metrics.HTTP_REQUEST_SECONDS.observe(
+            time.perf_counter() - start,
+            method=request.method, route=getattr(route, "path", "unmatched"), status=status
+        )
+
+def collect_runtime_metrics():
+    # Pool usage and stats cache counters, read at scrape time
+    pool = database.get_pool_stats()
+    cache_stats = cache.stats_cache.stats()
+    families = [
+        ("episcout_db_pool_checkouts_total", "Connection checkouts", "counter", [({}, pool["checkouts"])]),
+        ("episcout_db_pool_checkout_wait_seconds_total", "Time spent waiting for a pooled connection", "counter",
+         [({}, pool["checkout_wait_seconds_total"])]),
+        ("episcout_db_pool_checkout_wait_seconds_max", "Longest wait for a pooled connection", "gauge",
+         [({}, pool["checkout_wait_seconds_max"])]),
+        ("episcout_db_connections_opened_total", "DBAPI connections opened", "counter", [({}, pool["connections_opened"])]),
+        ("episcout_db_connections_closed_total", "DBAPI connections closed", "counter", [({}, pool["connections_closed"])]),
+        ("episcout_stats_cache_hits_total", "Stats cache hits", "counter", [({}, cache_stats["hits"])]),
+        ("episcout_stats_cache_misses_total", "Stats cache misses", "counter", [({}, cache_stats["misses"])]),
+        ("episcout_stats_cache_entries", "Entries in the stats cache", "gauge", [({}, cache_stats["size"])]),
+    ]
+    if "pool_size" in pool:
+        families.append(("episcout_db_pool_connections", "Pooled connections by state", "gauge", [
+            ({"state": "checked_out"}, pool["checked_out"]),
+            ({"state": "checked_in"}, pool["checked_in"]),
+            ({"state": "overflow"}, pool["overflow"]),
+        ]))
+    return families
+
+metrics.register_collector(collect_runtime_metrics)
+
 def get_db():
     db = database.SessionLocal()
     try:
@@ -33,20 +93,93 @@ def get_db():
 
 # --- Scan & Articles ---
 
-@app.post("/api/scan", response_model=schemas.ScanResult)
-def scan_news(request: schemas.ScanRequest, db: Session = Depends(get_db)):
-    # Trigger scan logic
-    return crawler.scan_news(db, request.fetch_unknown)
+@app.post("/api/scan", response_model=schemas.ScanJobDTO)
+def scan_news(request: schemas.ScanRequest):
+    # Queue a background scan (merged into the in-flight or follow-up one, see jobs.start_scan); poll GET /api/scan/{id}
+    return jobs.start_scan(request.fetch_unknown, request.force)
+
+@app.post("/api/scan/stream")
+def scan_news_stream(request: schemas.ScanRequest, http_request: Request):
+    """
+    Queue a scan like POST /api/scan (merged with pending/running ones)
+    and relay its events (see crawler.iter_scan) as they happen: NDJSON by
+    default, server-sent events when the client sends
+    `Accept: text/event-stream`. The first event is {"type": "job", "id"};
+    the scan keeps running if the client disconnects (poll GET /api/scan/{id}).
+    """
+    sse = "text/event-stream" in http_request.headers.get("accept", "")
+    subscription = jobs.Subscription()
+    job = jobs.start_scan(request.fetch_unknown, request.force, subscription)
+
+    def encode(event: dict) -> str:
+        data = json.dumps(event, ensure_ascii=False)
+        return f"event: {event['type']}\ndata: {data}\n\n" if sse else data + "\n"
+
+    def events():
+        yield encode({"type": "job", "id": job.id})
+        # A stream joining a running scan starts with the feeds it already finished
+        for feed in job.feeds:
+            if feed.status != "pending":
+                yield encode({"type": "feed", **feed.model_dump()})
+        for event in jobs.iter_events(subscription):
+            if event is None:
+                # Keep-alive so proxies do not time out a quiet stream
+                yield ": keep-alive\n\n" if sse else "\n"
+            else:
+                yield encode(event)
+
+    # No proxy buffering, otherwise nginx holds events back until the scan ends
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    return StreamingResponse(events(), media_type="text/event-stream" if sse else "application/x-ndjson", headers=headers)
+
+@app.get("/api/scan/{job_id}", response_model=schemas.ScanJobDTO)
+def get_scan(job_id: str):
+    job = jobs.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Scan job not found")
+    return job
+
+def set_next_cursor(response: Response, rows: list, limit: int, make_cursor):
+    # Keyset pagination: the next page starts after the last row of a full page
+    if rows and len(rows) == limit:
+        response.headers["X-Next-Cursor"] = make_cursor(rows[-1])
+
+def decode_cursor(cursor: str, decode):
+    try:
+        return decode(cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
 
 @app.get("/api/articles", response_model=List[schemas.ArticleDTO])
 def read_articles(
+    response: Response,
     skip: int = 0, 
     limit: int = 100, 
+    cursor: Optional[str] = None,
+    keyword: Optional[str] = None,
+    tag: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
-    articles = crud.get_articles(db, skip=skip, limit=limit)
+    after = decode_cursor(cursor, pagination.decode_article_cursor) if cursor else None
+    articles = crud.get_articles(db, skip=skip, limit=limit, after=after, keyword=keyword, tag=tag)
+    set_next_cursor(response, articles, limit, pagination.article_cursor)
     return articles
 
+@app.get("/api/articles/search", response_model=List[schemas.ArticleSearchResult])
+def search_articles(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    # Diacritic-insensitive full-text search over title + summary, best match first
+    ranked = search.search_article_ids(db, q, limit)
+    ranks = dict(ranked)
+    articles = crud.get_articles_by_ids(db, [article_id for article_id, _ in ranked])
+    return [
+        schemas.ArticleSearchResult.model_validate(a).model_copy(update={"rank": ranks[a.id]})
+        for a in articles
+    ]
+
 @app.post("/api/articles/save", response_model=schemas.ArticleDTO)
 def save_article(article: schemas.ArticleCreate, db: Session = Depends(get_db)):
     # Check if exists
@@ -55,6 +188,44 @@ def save_article(article: schemas.ArticleCreate, db: Session = Depends(get_db)):
         raise HTTPException(status_code=400, detail="Article already saved")
     return crud.create_article(db, article)
 
+@app.post("/api/articles/bulk", response_model=schemas.BulkSaveResult)
+def save_articles_bulk(articles: List[schemas.ArticleCreate], db: Session = Depends(get_db)):
+    # Import many articles at once: new links inserted, stored ones updated (see crud.upsert_articles)
+    items = crud.upsert_articles(db, articles)
+    counts = {status: sum(item.status == status for item in items) for status in ("inserted", "updated", "skipped")}
+    return schemas.BulkSaveResult(**counts, items=items)
+
+# --- Pending (unverified source) articles ---
+
+@app.get("/api/pending", response_model=List[schemas.PendingArticleDTO])
+def read_pending_articles(
+    response: Response,
+    status: str = "pending",
+    skip: int = 0,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    after = decode_cursor(cursor, pagination.decode_article_cursor) if cursor else None
+    rows = crud.get_pending_articles(db, status=status, skip=skip, limit=limit, after=after)
+    set_next_cursor(response, rows, limit, pagination.article_cursor)
+    return rows
+
+@app.post("/api/pending/approve", response_model=schemas.PendingReviewResult)
+def approve_pending_articles(review: schemas.PendingReview, db: Session = Depends(get_db)):
+    # Move the selected queue rows into the articles tables in one transaction
+    rows, missing = crud.find_pending_articles(db, review.ids, review.links)
+    keywords = [k.text for k in crud.get_keywords(db)] # same list as the scan
+    saved = crud.approve_pending_articles(db, rows, keywords)
+    return schemas.PendingReviewResult(processed=len(rows), article_ids=saved, missing=missing)
+
+@app.post("/api/pending/reject", response_model=schemas.PendingReviewResult)
+def reject_pending_articles(review: schemas.PendingReview, db: Session = Depends(get_db)):
+    # Rejected rows stay queued so later scans do not offer them again
+    rows, missing = crud.find_pending_articles(db, review.ids, review.links)
+    processed = crud.reject_pending_articles(db, rows)
+    return schemas.PendingReviewResult(processed=processed, missing=missing)
+
 # --- Stats ---
 
 @app.get("/api/stats/overview")
@@ -62,14 +233,32 @@ def get_stats_overview(db: Session = Depends(get_db)):
     return stats.get_overview_stats(db)
 
 @app.get("/api/stats/trends")
-def get_stats_trends(days: int = 7, db: Session = Depends(get_db)):
+def get_stats_trends(days: int = Query(7, ge=1, le=365), db: Session = Depends(get_db)):
     return stats.get_trend_data(db, days)
 
+@app.get("/api/db/pool")
+def get_db_pool():
+    # Connection pool usage and checkout wait times, for sizing DB_POOL_SIZE against workers
+    return database.get_pool_stats()
+
+@app.get("/api/stats/cache")
+def get_stats_cache():
+    # Hit/miss counters of the stats cache
+    return cache.stats_cache.stats()
+
+@app.get("/api/metrics")
+def get_metrics():
+    # Prometheus text exposition format (see metrics.py)
+    return Response(content=metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
 # --- Resources ---
 
 @app.get("/api/keywords", response_model=List[schemas.KeywordDTO])
-def read_keywords(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return crud.get_keywords(db, skip=skip, limit=limit)
+def read_keywords(response: Response, skip: int = 0, limit: int = 100, cursor: Optional[str] = None, db: Session = Depends(get_db)):
+    after_id = decode_cursor(cursor, pagination.decode_id_cursor) if cursor else None
+    keywords = crud.get_keywords(db, skip=skip, limit=limit, after_id=after_id)
+    set_next_cursor(response, keywords, limit, pagination.id_cursor)
+    return keywords
 
 @app.post("/api/keywords", response_model=schemas.KeywordDTO)
 def create_keyword(keyword: schemas.KeywordCreate, db: Session = Depends(get_db)):
@@ -86,8 +275,11 @@ def delete_keyword(keyword_id: int, db: Session = Depends(get_db)):
     return {"status": "success", "id": keyword_id}
 
 @app.get("/api/whitelist", response_model=List[schemas.WhitelistDTO])
-def read_whitelist(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return crud.get_whitelisted_domains(db, skip=skip, limit=limit)
+def read_whitelist(response: Response, skip: int = 0, limit: int = 100, cursor: Optional[str] = None, db: Session = Depends(get_db)):
+    after_id = decode_cursor(cursor, pagination.decode_id_cursor) if cursor else None
+    domains = crud.get_whitelisted_domains(db, skip=skip, limit=limit, after_id=after_id)
+    set_next_cursor(response, domains, limit, pagination.id_cursor)
+    return domains
 
 @app.post("/api/whitelist", response_model=schemas.WhitelistDTO)
 def create_whitelist(domain: schemas.WhitelistCreate, db: Session = Depends(get_db)):
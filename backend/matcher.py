@@ -0,0 +1,124 @@
+import threading
+from collections import deque
+
+class Automaton:
+    """
+    Aho-Corasick automaton over lowercase patterns, each carrying a payload.
+    finditer() reports every occurrence (overlapping ones included) in one
+    pass over the text.
+    """
+
+    def __init__(self):
+        # State 0 is the root. Each state: goto dict, fail link, outputs (pattern length, payload).
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+
+    def add(self, pattern: str, payload):
+        state = 0
+        for ch in pattern:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+                self._goto[state][ch] = nxt
+            state = nxt
+        self._out[state].append((len(pattern), payload))
+
+    def build(self):
+        # BFS to compute fail links and merge outputs along them
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                f = self._fail[state]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[nxt] = self._goto[f].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def finditer(self, text: str):
+        # (start, end, payload) for every pattern occurrence; `text` must already be lowercase
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for length, payload in out[state]:
+                yield i + 1 - length, i + 1, payload
+
+class KeywordMatcher(Automaton):
+    """
+    Aho-Corasick automaton over the (lowercased) keyword and exclusion lists.
+    One pass over the text finds every keyword; match() returns the same
+    ", "-joined string as the old per-keyword substring scan.
+    """
+
+    def __init__(self, keywords: list[str], excluded: list[str]):
+        super().__init__()
+        self.keywords = tuple(keywords)
+        self.excluded = tuple(excluded)
+
+        # Payloads: >= 0 are keyword indices, -1 marks an exclusion
+        self._always = [] # Empty keywords match any non-empty text
+        for i, kw in enumerate(self.keywords):
+            self._add_pattern(kw.lower(), i)
+        for ex in self.excluded:
+            self._add_pattern(ex.lower(), -1)
+        self.build()
+
+    def _add_pattern(self, pattern: str, pattern_id: int):
+        if not pattern:
+            if pattern_id >= 0:
+                self._always.append(pattern_id)
+            return
+        self.add(pattern, pattern_id)
+
+    def match(self, text: str) -> str | None:
+        if not text:
+            return None
+
+        found = set(self._always)
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for ch in text.lower():
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for _, pattern_id in out[state]:
+                if pattern_id < 0:
+                    # Exclusion hit: advice/QA article
+                    return None
+                found.add(pattern_id)
+
+        if not found:
+            return None
+        return ", ".join(self.keywords[i] for i in sorted(found))
+
+# --- Shared instance ---
+
+_lock = threading.Lock()
+_matcher: KeywordMatcher | None = None
+
+def get_keyword_matcher(keywords: list[str], excluded: list[str]) -> KeywordMatcher:
+    """
+    Return the compiled matcher, building it only when it was invalidated
+    or the keyword list differs (e.g. changed by another worker process).
+    """
+    global _matcher
+    matcher = _matcher
+    if matcher is not None and matcher.keywords == tuple(keywords) and matcher.excluded == tuple(excluded):
+        return matcher
+    with _lock:
+        if _matcher is None or _matcher.keywords != tuple(keywords) or _matcher.excluded != tuple(excluded):
+            _matcher = KeywordMatcher(keywords, excluded)
+        return _matcher
+
+def invalidate():
+    global _matcher
+    with _lock:
+        _matcher = None
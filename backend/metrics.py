@@ -0,0 +1,168 @@
+import functools
+import threading
+import time
+from contextlib import contextmanager
+
+# In-process metrics in the Prometheus text format, served by GET /api/metrics.
+# Counters and histograms are recorded on the hot paths; collectors add values
+# read at scrape time (pool usage, cache counters). Per process: with several
+# uvicorn workers each one reports its own numbers.
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_registry = []
+_collectors = []
+
+def _format_labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    escaped = (
+        (k, str(v).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n"))
+        for k, v in labels.items()
+    )
+    return "{" + ",".join(f'{k}="{v}"' for k, v in escaped) + "}"
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Metric:
+    type = "untyped"
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+        self._values = {} # label values -> value / histogram state
+        _registry.append(self)
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(str(labels.get(name, "")) for name in self.labels)
+
+    def samples(self):
+        # [(sample name, labels dict, value)]
+        raise NotImplementedError
+
+class Counter(Metric):
+    type = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            items = list(self._values.items())
+        return [(self.name, dict(zip(self.labels, key)), value) for key, value in items]
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = (), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0.0, 0] # bucket counts, sum, count
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[0][i] += 1
+                    break
+            state[1] += value
+            state[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def samples(self):
+        with self._lock:
+            items = [(key, (list(state[0]), state[1], state[2])) for key, state in self._values.items()]
+        samples = []
+        for key, (counts, total, count) in items:
+            labels = dict(zip(self.labels, key))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                samples.append((self.name + "_bucket", {**labels, "le": _format_value(float(bound))}, cumulative))
+            samples.append((self.name + "_bucket", {**labels, "le": "+Inf"}, count))
+            samples.append((self.name + "_sum", labels, total))
+            samples.append((self.name + "_count", labels, count))
+        return samples
+
+def register_collector(collect):
+    """
+    collect() -> [(name, help, type, [(labels dict, value)])], called on every
+    scrape; for values that already live elsewhere (pool stats, caches).
+    """
+    _collectors.append(collect)
+
+def render() -> str:
+    lines = []
+    for metric in _registry:
+        samples = metric.samples()
+        if not samples:
+            continue
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.type}")
+        lines.extend(f"{name}{_format_labels(labels)} {_format_value(value)}" for name, labels, value in samples)
+    for collect in _collectors:
+        for name, help, metric_type, values in collect():
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            lines.extend(f"{name}{_format_labels(labels)} {_format_value(value)}" for labels, value in values)
+    return "\n".join(lines) + "\n"
+
+# --- Helpers ---
+
+def timed(function: str | None = None):
+    # Decorator: record the call duration in FUNCTION_SECONDS
+    def decorate(fn):
+        name = function or f"{fn.__module__.rsplit('.', 1)[-1]}.{fn.__name__}"
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                FUNCTION_SECONDS.observe(time.perf_counter() - start, function=name)
+        return wrapper
+    return decorate
+
+def timed_iter(iterable, timings: dict, key: str):
+    # Yield from `iterable`, adding the time spent waiting for each item to timings[key]
+    iterator = iter(iterable)
+    while True:
+        start = time.perf_counter()
+        try:
+            item = next(iterator)
+        except StopIteration:
+            return
+        finally:
+            timings[key] = timings.get(key, 0.0) + time.perf_counter() - start
+        yield item
+
+# --- Metrics ---
+
+FEED_FETCH_SECONDS = Histogram("episcout_feed_fetch_seconds", "Feed download time (request + body)", ("feed", "status"))
+FEED_PARSE_SECONDS = Histogram("episcout_feed_parse_seconds", "feedparser time per downloaded feed", ("feed",))
+SCAN_ENTRIES = Counter("episcout_scan_entries_total", "Feed entries by outcome: processed, matched, saved", ("outcome",))
+SCAN_STAGE_SECONDS = Histogram("episcout_scan_stage_seconds", "Time per scan spent in each stage", ("stage",))
+SCAN_SECONDS = Histogram("episcout_scan_seconds", "Total scan_news duration", ("mode",))
+SCANS = Counter("episcout_scans_total", "Finished scan jobs by status", ("status",))
+DB_STATEMENTS = Counter("episcout_db_statements_total", "SQL statements executed", ("operation",))
+DB_STATEMENT_SECONDS = Histogram("episcout_db_statement_seconds", "SQL statement execution time", ("operation",))
+FUNCTION_SECONDS = Histogram("episcout_function_seconds", "Duration of instrumented crud/stats functions", ("function",))
+HTTP_REQUEST_SECONDS = Histogram("episcout_http_request_seconds", "API request latency per route", ("method", "route", "status"))
@@ -0,0 +1,136 @@
+from backend import database, models, urls, crud, search
+from sqlalchemy import inspect, text, exists, func, and_, or_
+import argparse
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def add_missing_columns(engine):
+    """
+    create_all only creates missing tables; add columns and indexes
+    introduced on existing tables since the database was created.
+    """
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+
+    for table in models.Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        existing_columns = {c["name"] for c in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing_columns:
+                continue
+            col_type = column.type.compile(dialect=engine.dialect)
+            with engine.begin() as conn:
+                conn.execute(text(f"ALTER TABLE {table.name} ADD {column.name} {col_type} NULL"))
+            logger.info(f"Added column {table.name}.{column.name}")
+
+        existing_indexes = {i["name"] for i in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing_indexes:
+                index.create(bind=engine)
+                logger.info(f"Created index {index.name}")
+
+def backfill_link_hashes(db, batch_size: int = 1000):
+    total = 0
+    while True:
+        rows = db.query(models.ArticleIdentity).filter(models.ArticleIdentity.link_hash.is_(None)).limit(batch_size).all()
+        if not rows:
+            break
+        for row in rows:
+            row.link_hash = urls.link_hash(row.link or "")
+        db.commit()
+        total += len(rows)
+    logger.info(f"Backfilled link_hash for {total} articles")
+
+def backfill_article_terms(db, batch_size: int = 1000):
+    """
+    Fill article_tags / article_keywords from the comma-joined
+    details.tags / details.keywords_matched of articles that have none of
+    those rows yet (resumable: safe to re-run after a partial backfill).
+    """
+    details = models.ArticleDetails
+    has_tags = exists().where(models.ArticleTag.article_id == details.article_id)
+    has_keywords = exists().where(models.ArticleKeyword.article_id == details.article_id)
+    missing_tags = and_(details.tags.isnot(None), details.tags != "", ~has_tags)
+    missing_keywords = and_(details.keywords_matched.isnot(None), details.keywords_matched != "", ~has_keywords)
+    total = 0
+    last_id = 0
+    while True:
+        rows = db.query(details.id, details.article_id, details.tags, details.keywords_matched,
+                        missing_tags.label("missing_tags"), missing_keywords.label("missing_keywords"))\
+            .filter(details.id > last_id, or_(missing_tags, missing_keywords))\
+            .order_by(details.id)\
+            .limit(batch_size).all()
+        if not rows:
+            break
+        tag_rows, keyword_rows = [], []
+        for row in rows:
+            tags, keywords = crud.article_term_rows(row.article_id, row.tags, row.keywords_matched)
+            if row.missing_tags:
+                tag_rows.extend(tags)
+            if row.missing_keywords:
+                keyword_rows.extend(keywords)
+        crud.insert_article_terms(db, tag_rows, keyword_rows)
+        db.commit()
+        total += len(rows)
+        last_id = rows[-1].id
+    logger.info(f"Backfilled tag/keyword rows for {total} articles")
+
+def backfill_search_index(db, batch_size: int = 1000):
+    # Articles saved before article_search existed
+    total = 0
+    while True:
+        rows = db.query(models.ArticleIdentity.id, models.ArticleIdentity.title, models.ArticleDetails.summary)\
+            .outerjoin(models.ArticleDetails, models.ArticleDetails.article_id == models.ArticleIdentity.id)\
+            .outerjoin(models.ArticleSearch, models.ArticleSearch.article_id == models.ArticleIdentity.id)\
+            .filter(models.ArticleSearch.article_id.is_(None))\
+            .order_by(models.ArticleIdentity.id)\
+            .limit(batch_size).all()
+        if not rows:
+            break
+        search.index_articles(db, [(row.id, row.title, row.summary) for row in rows])
+        db.commit()
+        total += len(rows)
+    logger.info(f"Indexed {total} articles for search")
+
+def rebuild_case_rollups(db):
+    count = crud.rebuild_case_rollups(db)
+    logger.info(f"Rebuilt {count} daily case rollups")
+
+def case_rollups_complete(db) -> bool:
+    # Every dated DiseaseCase adds 1 to one rollup's report_count, so the totals match
+    # unless cases were stored before the rollups existed (or edited by hand)
+    cases = db.query(func.count(models.DiseaseCase.id)).filter(models.DiseaseCase.report_date.isnot(None)).scalar()
+    folded = db.query(func.coalesce(func.sum(models.DailyCaseRollup.report_count), 0)).scalar()
+    return cases == folded
+
+def migrate(rebuild_rollups: bool = False):
+    logger.info("Creating missing tables...")
+    models.Base.metadata.create_all(bind=database.engine)
+
+    logger.info("Adding missing columns...")
+    add_missing_columns(database.engine)
+
+    logger.info("Creating full-text search index...")
+    search.ensure_index(database.engine)
+
+    db = database.SessionLocal()
+    try:
+        backfill_link_hashes(db)
+        backfill_search_index(db)
+        backfill_article_terms(db)
+        # Rollups missing history (e.g. cases stored before the table existed)
+        if rebuild_rollups or not case_rollups_complete(db):
+            rebuild_case_rollups(db)
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Create/upgrade the EpiScout database schema")
+    arg_parser.add_argument("--rebuild-rollups", action="store_true",
+                            help="Recompute daily_case_rollups from disease_cases")
+    args = arg_parser.parse_args()
+    migrate(rebuild_rollups=args.rebuild_rollups)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey, Unicode, UnicodeText
+from sqlalchemy import Column, Integer, String, Boolean, Date, DateTime, Text, ForeignKey, Unicode, UnicodeText, Index, UniqueConstraint, PrimaryKeyConstraint
 from sqlalchemy.orm import relationship
 from .database import Base
 from datetime import datetime
@@ -9,14 +9,25 @@ class ArticleIdentity(Base):
     id = Column(Integer, primary_key=True, index=True)
     title = Column(Unicode(500), nullable=True) # NVARCHAR
     link = Column(String(500), unique=True, index=True) # Link is usually ASCII, but String is fine
+    link_hash = Column(String(64), index=True, nullable=True) # sha256 of the canonical link (see urls.py)
     published_date = Column(DateTime, default=datetime.utcnow)
 
+    # Listing order / keyset pagination key
+    __table_args__ = (Index("ix_article_identity_published_id", "published_date", "id"),)
+
     # Relationship 1-1 with details
     details = relationship("ArticleDetails", back_populates="identity", uselist=False, cascade="all, delete-orphan")
     
     # Relationship 1-n with disease cases
     cases = relationship("DiseaseCase", back_populates="article", cascade="all, delete-orphan")
 
+    # Indexed copies of details.tags / details.keywords_matched (one row per term)
+    tag_rows = relationship("ArticleTag", cascade="all, delete-orphan")
+    keyword_rows = relationship("ArticleKeyword", cascade="all, delete-orphan")
+
+    # Diacritic-folded copy of title/summary for full-text search (see search.py)
+    search_row = relationship("ArticleSearch", uselist=False, cascade="all, delete-orphan")
+
     @property
     def summary(self):
         return self.details.summary if self.details else None
@@ -51,6 +62,40 @@ class ArticleDetails(Base):
     
     identity = relationship("ArticleIdentity", back_populates="details")
 
+class ArticleTag(Base):
+    __tablename__ = "article_tags"
+
+    id = Column(Integer, primary_key=True, index=True)
+    article_id = Column(Integer, ForeignKey("article_identity.id"))
+    tag = Column(Unicode(100)) # e.g. "Cảnh báo"
+
+    __table_args__ = (
+        UniqueConstraint("article_id", "tag", name="uq_article_tag"),
+        Index("ix_article_tags_tag_article", "tag", "article_id"),
+    )
+
+class ArticleKeyword(Base):
+    __tablename__ = "article_keywords"
+
+    id = Column(Integer, primary_key=True, index=True)
+    article_id = Column(Integer, ForeignKey("article_identity.id"))
+    keyword = Column(Unicode(255)) # lowercased, e.g. "sởi"
+
+    __table_args__ = (
+        UniqueConstraint("article_id", "keyword", name="uq_article_keyword"),
+        Index("ix_article_keywords_keyword_article", "keyword", "article_id"),
+    )
+
+class ArticleSearch(Base):
+    __tablename__ = "article_search"
+
+    article_id = Column(Integer, ForeignKey("article_identity.id"), autoincrement=False)
+    title = Column(Unicode(500), nullable=True) # folded, e.g. "sot xuat huyet"
+    body = Column(UnicodeText, nullable=True)   # folded summary
+
+    # Named key: SQL Server full-text indexes reference it (KEY INDEX pk_article_search)
+    __table_args__ = (PrimaryKeyConstraint("article_id", name="pk_article_search"),)
+
 class DiseaseCase(Base):
     __tablename__ = "disease_cases"
 
@@ -64,6 +109,19 @@ class DiseaseCase(Base):
     
     article = relationship("ArticleIdentity", back_populates="cases")
 
+class DailyCaseRollup(Base):
+    # Materialized SUM(case_count) per day/disease/location, kept up to date by crud
+    __tablename__ = "daily_case_rollups"
+
+    id = Column(Integer, primary_key=True, index=True)
+    day = Column(Date, index=True)
+    disease_name = Column(Unicode(255), default="") # "" when unknown
+    location = Column(Unicode(255), default="")     # "" when unknown
+    case_count = Column(Integer, default=0)
+    report_count = Column(Integer, default=0)       # number of DiseaseCase rows folded in
+
+    __table_args__ = (UniqueConstraint("day", "disease_name", "location", name="uq_daily_case_rollup"),)
+
 class WhitelistDomain(Base):
     __tablename__ = "whitelist_domains"
 
@@ -77,3 +135,40 @@ class Keyword(Base):
     id = Column(Integer, primary_key=True, index=True)
     text = Column(Unicode(255), unique=True, index=True) # Support Vietnamese keywords
     created_at = Column(DateTime, default=datetime.utcnow)
+
+class FeedState(Base):
+    __tablename__ = "feed_states"
+
+    id = Column(Integer, primary_key=True, index=True)
+    url = Column(String(500), unique=True, index=True)
+
+    # Conditional-GET cache of the last full download
+    etag = Column(String(255), nullable=True)
+    last_modified = Column(String(255), nullable=True)
+    content_hash = Column(String(64), nullable=True) # sha256 hex of the body
+
+    # Incremental watermarks: newest entry seen (crawler.entry_key) and its date
+    last_entry_hash = Column(String(64), nullable=True)
+    newest_published = Column(DateTime, nullable=True)
+    checked_at = Column(DateTime, default=datetime.utcnow)
+
+class PendingArticle(Base):
+    # Matched articles from sources outside the whitelist, waiting for review.
+    # Approved rows move to article_identity; rejected ones stay so scans do not bring them back.
+    __tablename__ = "pending_articles"
+
+    id = Column(Integer, primary_key=True, index=True)
+    link = Column(String(500))
+    link_hash = Column(String(64), unique=True, index=True) # sha256 of the canonical link (see urls.py)
+    title = Column(Unicode(500), nullable=True)
+    summary = Column(UnicodeText, nullable=True)
+    source = Column(Unicode(255), nullable=True)
+    published_date = Column(DateTime, default=datetime.utcnow)
+    keywords_matched = Column(Unicode(500), nullable=True)
+    tags = Column(Unicode(500), nullable=True)
+    status = Column(String(20), default="pending") # pending, rejected
+    first_seen_at = Column(DateTime, default=datetime.utcnow)
+    last_seen_at = Column(DateTime, default=datetime.utcnow)
+
+    # Review queue order / keyset pagination key
+    __table_args__ = (Index("ix_pending_articles_status_published_id", "status", "published_date", "id"),)
@@ -0,0 +1,44 @@
+import base64
+import json
+from datetime import datetime
+
+# Opaque keyset cursors: base64url(JSON) of the sort key of the last row of a page
+
+def encode_cursor(*values) -> str:
+    payload = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str) -> list:
+    """
+    Raises ValueError for anything that was not produced by encode_cursor.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if not isinstance(payload, list) or not payload:
+        raise ValueError("Invalid cursor")
+    return payload
+
+def article_cursor(article) -> str:
+    return encode_cursor(article.published_date, article.id)
+
+def decode_article_cursor(cursor: str) -> tuple[datetime, int]:
+    payload = decode_cursor(cursor)
+    try:
+        published_date, article_id = payload
+        return datetime.fromisoformat(published_date), int(article_id)
+    except (TypeError, ValueError):
+        raise ValueError("Invalid cursor")
+
+def id_cursor(row) -> str:
+    return encode_cursor(row.id)
+
+def decode_id_cursor(cursor: str) -> int:
+    payload = decode_cursor(cursor)
+    try:
+        (row_id,) = payload
+        return int(row_id)
+    except (TypeError, ValueError):
+        raise ValueError("Invalid cursor")
@@ -1,26 +1,26 @@
 import sys
-from rapidfuzz import fuzz
 import os
 import io
-import requests
+import importlib
+import threading
 import time
-from datetime import datetime, timedelta
-from dateutil import parser
-import pytz
-import nltk
-from nltk.tokenize import sent_tokenize, word_tokenize
-import feedparser
-from http.client import IncompleteRead
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 import re
 import base64
-from urllib.parse import urlparse, urlunparse, unquote, urljoin
+from urllib.parse import urlparse, urlunparse, unquote
 import json
-from bs4 import BeautifulSoup
 import argparse
 
-nltk.download('punkt')
+# Only the standard library is imported at module load: requests, bs4, nltk,
+# rapidfuzz (dedup), dateutil, pytz and feedparser are imported where they are
+# first used, so `rs.py --help` and `import backend.rs` stay fast and offline.
 
-sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+def import_sibling(name):
+    # Sibling backend module, whether rs.py runs as a script or as backend.rs
+    if __package__:
+        return importlib.import_module(f".{name}", __package__)
+    return importlib.import_module(name)
 
 class DateTimeEncoder(json.JSONEncoder):
     def default(self, obj):
@@ -28,25 +28,33 @@ class DateTimeEncoder(json.JSONEncoder):
             return obj.strftime('%Y-%m-%d %H:%M:%S %Z')
         return json.JSONEncoder.default(self, obj)
 
-TZ_INFOS = {
-    "UTC": pytz.utc,
-    "EDT": pytz.timezone("America/New_York"),
-    "EST": pytz.timezone("America/New_York"),
-    "PDT": pytz.timezone("America/Los_Angeles"),
-    "PST": pytz.timezone("America/Los_Angeles"),
-    "CST": pytz.timezone("America/Chicago"),
-    "CDT": pytz.timezone("America/Chicago"),
-    "MST": pytz.timezone("America/Denver"),
-    "MDT": pytz.timezone("America/Denver"),
-    "BST": pytz.timezone("Europe/London"),
-    "GMT": pytz.utc,
-    "CET": pytz.timezone("Europe/Paris"),
-    "CEST": pytz.timezone("Europe/Paris"),
-    "ICT": pytz.timezone("Asia/Bangkok"),
-    "SGT": pytz.timezone("Asia/Singapore"),
-    "JST": pytz.timezone("Asia/Tokyo"),
-    "IST": pytz.timezone("Asia/Kolkata"),
+TZ_NAMES = {
+    "UTC": "UTC",
+    "EDT": "America/New_York",
+    "EST": "America/New_York",
+    "PDT": "America/Los_Angeles",
+    "PST": "America/Los_Angeles",
+    "CST": "America/Chicago",
+    "CDT": "America/Chicago",
+    "MST": "America/Denver",
+    "MDT": "America/Denver",
+    "BST": "Europe/London",
+    "GMT": "UTC",
+    "CET": "Europe/Paris",
+    "CEST": "Europe/Paris",
+    "ICT": "Asia/Bangkok",
+    "SGT": "Asia/Singapore",
+    "JST": "Asia/Tokyo",
+    "IST": "Asia/Kolkata",
 }
+_tz_infos = None
+
+def get_tz_infos():
+    global _tz_infos
+    if _tz_infos is None:
+        import pytz
+        _tz_infos = {abbr: pytz.timezone(name) for abbr, name in TZ_NAMES.items()}
+    return _tz_infos
 
 predefined_keywords = {
     "sebs": "Bại liệt, cúm gia cầm, dịch hạch, đậu mùa, bệnh tả, tay chân miệng, sốt phát ban, sởi, sốt xuất huyết, bạch hầu, ho gà, viêm não nhật bản, viêm não vi rút, thủy đậu, cúm A, cúm B, cúm mùa, não mô cầu, bệnh lạ, viêm phổi nặng, bệnh mới nổi, chưa rõ tác nhân gây bệnh, bùng phát ca bệnh, gia tăng số ca bệnh, gia tăng số lượng người nhập viện, hàng loạt ca bệnh, ổ dịch, vụ dịch, phản ứng nặng sau tiêm vắc xin, tử vong do bệnh truyền nhiễm, tử vong không rõ nguyên nhân, tử vong sau tiêm vắc xin, động vật ốm chết hàng loạt, gia cầm ốm chết, unknown disease, emerging disease, re-emerging disease, reemerging disease, avian influenza, H5N1, Bird Flu, Ebola, MERS, public health emergency, pandemic threat",
@@ -54,25 +62,177 @@ predefined_keywords = {
 }
 
 def parse_date(date_string):
+    from dateutil import parser
     try:
-        dt = parser.parse(date_string, tzinfos=TZ_INFOS)
+        dt = parser.parse(date_string, tzinfos=get_tz_infos())
         if dt.tzinfo is None:
-            dt = dt.replace(tzinfo=pytz.utc)
+            dt = dt.replace(tzinfo=timezone.utc)
         return dt
     except ValueError:
         return None
 
+# --- Tokenizer ---
+# The NLTK punkt data is looked up locally only (never downloaded at run time);
+# install it once with `python -m nltk.downloader punkt_tab`. Without it a
+# regex splitter is used.
+
+SENTENCE_RE = re.compile(r'(?<=[.!?…])\s+')
+WORD_RE = re.compile(r'\w+|[^\w\s]')
+
+_nltk_tokenizer = None # cached result of the local resource check
+_nltk_lock = threading.Lock()
+
+def nltk_tokenizer_available():
+    global _nltk_tokenizer
+    if _nltk_tokenizer is None:
+        with _nltk_lock: # snippets are tokenized from worker threads
+            if _nltk_tokenizer is None:
+                try:
+                    import nltk
+                    nltk.data.find("tokenizers/punkt_tab")
+                    _nltk_tokenizer = True
+                except (ImportError, LookupError):
+                    print("NLTK punkt_tab not found locally, using the regex tokenizer "
+                          "(install with: python -m nltk.downloader punkt_tab)", file=sys.stderr)
+                    _nltk_tokenizer = False
+    return _nltk_tokenizer
+
+def sent_tokenize(text):
+    if nltk_tokenizer_available():
+        from nltk.tokenize import sent_tokenize as nltk_sent_tokenize
+        return nltk_sent_tokenize(text)
+    return [s for s in SENTENCE_RE.split(text.strip()) if s]
+
+def word_tokenize(text):
+    if nltk_tokenizer_available():
+        from nltk.tokenize import word_tokenize as nltk_word_tokenize
+        return nltk_word_tokenize(text)
+    return WORD_RE.findall(text)
+
 def summarize_text(text, max_sentences=3):
     sentences = sent_tokenize(text)
     return ' '.join(sentences[:max_sentences])
 
-def fetch_and_filter_article(url):
+# Snippet fetching settings
+FETCH_WORKERS = int(os.getenv("RS_FETCH_WORKERS", "16"))
+FETCH_TIMEOUT = (5, 15) # connect, read
+MAX_PAGE_BYTES = int(os.getenv("RS_MAX_PAGE_BYTES", str(512 * 1024)))
+CHUNK_SIZE = 16 * 1024
+
+DESCRIPTION_SELECTORS = ['meta[name="description"]', 'meta[property="og:description"]', 'meta[name="twitter:description"]']
+DESCRIPTION_META_RE = re.compile(rb'<meta[^>]+(?:name|property)\s*=\s*["\']?(?:description|og:description|twitter:description)', re.IGNORECASE)
+PARAGRAPH_RE = re.compile(rb'<p[\s>].*?</p\s*>', re.IGNORECASE | re.DOTALL)
+TAG_RE = re.compile(rb'<[^>]+>')
+
+_html_parser = None
+
+def html_parser_backend():
+    # lxml is much faster than the pure-Python html.parser; optional dependency
+    global _html_parser
+    if _html_parser is None:
+        _html_parser = os.getenv("RS_HTML_PARSER")
+        if not _html_parser:
+            try:
+                import lxml # noqa: F401
+                _html_parser = "lxml"
+            except ImportError:
+                _html_parser = "html.parser"
+    return _html_parser
+
+_session = None
+_session_lock = threading.Lock()
+
+def get_session(pool_size=FETCH_WORKERS):
+    """
+    Shared keep-alive session; the connection pool is sized for the fetch workers.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            import requests
+            import requests.adapters
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers["User-Agent"] = "Mozilla/5.0 (compatible; EpiScout/1.0)"
+            _session = session
+        return _session
+
+def read_page_head(response, max_bytes=MAX_PAGE_BYTES):
+    """
+    Read only as much HTML as the snippet needs: up to </head> when it carries a
+    description meta tag, otherwise up to the first paragraph with more than 10
+    words, and never more than max_bytes.
+    """
+    buf = bytearray()
+    head_end = -1
+    scan_from = 0
+    for chunk in response.iter_content(CHUNK_SIZE):
+        buf += chunk
+        if head_end < 0:
+            head_end = buf.lower().find(b"</head", max(0, len(buf) - len(chunk) - 8))
+            if head_end >= 0 and DESCRIPTION_META_RE.search(buf, 0, head_end):
+                break
+        if head_end >= 0:
+            for match in PARAGRAPH_RE.finditer(buf, max(scan_from, head_end)):
+                if len(TAG_RE.sub(b" ", match.group(0)).split()) > 10:
+                    return bytes(buf)
+                scan_from = match.end()
+        if len(buf) >= max_bytes:
+            break
+    return bytes(buf)
+
+_cache = None
+_cache_loaded = False
+
+def get_snippet_cache():
+    # Shared on-disk snippet cache (see snippet_cache.py); None when disabled
+    global _cache, _cache_loaded
+    with _session_lock:
+        if not _cache_loaded:
+            try:
+                _cache = import_sibling("snippet_cache").from_env()
+            except Exception as e:
+                print(f"Snippet cache disabled: {e}", file=sys.stderr)
+                _cache = None
+            _cache_loaded = True
+        return _cache
+
+def disable_snippet_cache():
+    global _cache, _cache_loaded
+    with _session_lock:
+        _cache, _cache_loaded = None, True
+
+def _cache_put(cache, url, snippet):
+    # Cache write errors never cost the fetched snippet
+    try:
+        cache.put(url, snippet)
+    except Exception:
+        pass
+
+def fetch_and_filter_article(url, session=None):
+    cache = get_snippet_cache()
+    if cache:
+        try:
+            hit, snippet = cache.get(url)
+        except Exception:
+            hit = False # locked / corrupt cache file: fetch the page instead
+        if hit:
+            return snippet
+
+    response = None
     try:
-        response = requests.get(url, timeout=15)
+        session = session or get_session()
+        response = session.get(url, timeout=FETCH_TIMEOUT, stream=True)
+        if cache and 400 <= response.status_code < 500:
+            # Missing / forbidden page: remember the failure for a while
+            _cache_put(cache, url, None)
         response.raise_for_status()
-        soup = BeautifulSoup(response.content, 'html.parser')
+        from bs4 import BeautifulSoup
+        soup = BeautifulSoup(read_page_head(response), html_parser_backend())
         description = ""
-        for tag in ['meta[name="description"]', 'meta[property="og:description"]', 'meta[name="twitter:description"]']:
+        for tag in DESCRIPTION_SELECTORS:
             desc = soup.select_one(tag)
             if desc and desc.get('content'):
                 description = desc['content'].strip()
@@ -84,9 +244,35 @@ def fetch_and_filter_article(url):
                 if len(word_tokenize(text)) > 10:
                     description = text
                     break
-        return summarize_text(description)
+        snippet = summarize_text(description)
+        if cache:
+            _cache_put(cache, url, snippet)
+        return snippet
     except:
         return None
+    finally:
+        if response is not None:
+            response.close()
+
+def fetch_snippets(urls, workers=FETCH_WORKERS):
+    """
+    Fetch article snippets concurrently over the shared session.
+    Returns {url: snippet or None}.
+    """
+    urls = list(dict.fromkeys(urls))
+    if not urls:
+        return {}
+    session = get_session(max(workers, 1))
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(urls)))) as pool:
+        snippets = dict(zip(urls, pool.map(lambda u: fetch_and_filter_article(u, session), urls)))
+
+    cache = get_snippet_cache()
+    if cache:
+        try:
+            cache.prune()
+        except Exception as e:
+            print(f"Snippet cache prune failed: {e}", file=sys.stderr)
+    return snippets
 
 def trim_url(url):
     decoded_url = unquote(url)
@@ -126,16 +312,20 @@ def process_keywords(keywords):
             processed.append(keyword.strip())
     return processed
 
-def run_news_search(keywords, ndays=3):
+def run_news_search(keywords, ndays=3, workers=FETCH_WORKERS):
+    import feedparser
+    NearDuplicateIndex = import_sibling("dedup").NearDuplicateIndex
+
     feed_urls = [
     'https://yoururllist/rss/home.rss',
     'https://yoururllist.rss',
     'https://yoururllist/rss'
     ]
     keywords = process_keywords(keywords)
-    seen_titles = {}
+    seen_titles = NearDuplicateIndex(threshold=95)
     totalCount = 0
-    date_threshold = datetime.now(pytz.utc) - timedelta(days=ndays)
+    candidates = []
+    date_threshold = datetime.now(timezone.utc) - timedelta(days=ndays)
     for url in feed_urls:
         try:
             feed = feedparser.parse(url)
@@ -149,28 +339,40 @@ def run_news_search(keywords, ndays=3):
             if not title or not link or not pub_date or pub_date < date_threshold:
                 continue
             normalized_title = title.lower().strip()
-            if any(fuzz.ratio(normalized_title, existing) >= 95 for existing in seen_titles):
+            if seen_titles.is_duplicate(normalized_title):
                 continue
             if not any(k.lower() in normalized_title for k in keywords):
                 continue
-            seen_titles[normalized_title] = title
-            snippet = fetch_and_filter_article(link)
-            if not snippet or len(word_tokenize(snippet)) < 10:
-                continue
-            totalCount += 1
-            print(f"\n[{totalCount}] {title}")
-            print(f"Ngày: {pub_date.strftime('%Y-%m-%d %H:%M')}")
-            print(f"Link: {link}")
-            print(f"Tóm tắt: {snippet}")
-            print("-" * 80)
+            seen_titles.add(normalized_title)
+            candidates.append((title, link, pub_date))
+
+    # Enrich all matches concurrently, then print in feed order
+    snippets = fetch_snippets([link for _, link, _ in candidates], workers)
+    for title, link, pub_date in candidates:
+        snippet = snippets.get(link)
+        if not snippet or len(word_tokenize(snippet)) < 10:
+            continue
+        totalCount += 1
+        print(f"\n[{totalCount}] {title}")
+        print(f"Ngày: {pub_date.strftime('%Y-%m-%d %H:%M')}")
+        print(f"Link: {link}")
+        print(f"Tóm tắt: {snippet}")
+        print("-" * 80)
 
 def run_as_script():
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
     parser = argparse.ArgumentParser(description="RSS news keyword filter tool")
     parser.add_argument("--keywords", type=str, required=True,
                         help='Comma-separated keywords (e.g., "sốt xuất huyết, bạch hầu") or predefined key like "sebs"')
     parser.add_argument("--days", type=int, default=3,
                         help="Number of past days to include in the search (default: 3)")
+    parser.add_argument("--workers", type=int, default=FETCH_WORKERS,
+                        help=f"Concurrent article page downloads (default: {FETCH_WORKERS})")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Do not read or write the on-disk snippet cache (RS_CACHE_PATH)")
     args = parser.parse_args()
+    if args.no_cache:
+        disable_snippet_cache()
 
     keywords_input = [kw.strip() for kw in args.keywords.split(",") if kw.strip()]
     ndays = args.days
@@ -178,7 +380,7 @@ def run_as_script():
     print(f"Searching news for keywords: {keywords_input}")
     print(f"Searching past {ndays} days\n")
 
-    run_news_search(keywords_input, ndays)
+    run_news_search(keywords_input, ndays, args.workers)
 
 if __name__ == "__main__":
     run_as_script()
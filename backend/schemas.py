@@ -22,6 +22,44 @@ class ArticleDTO(ArticleBase):
     class Config:
         from_attributes = True
 
+class ArticleSearchResult(ArticleDTO):
+    rank: float = 0 # higher is more relevant
+
+class BulkArticleStatus(BaseModel):
+    link: str
+    status: str # inserted, updated, skipped
+    id: Optional[int] = None
+
+class BulkSaveResult(BaseModel):
+    inserted: int
+    updated: int
+    skipped: int
+    items: List[BulkArticleStatus] # same order as the request
+
+class PendingArticleDTO(ArticleBase):
+    id: int
+    status: str # pending, rejected
+    first_seen_at: datetime
+    last_seen_at: datetime
+    class Config:
+        from_attributes = True
+
+class PendingReview(BaseModel):
+    # Select pending articles by id and/or link
+    ids: List[int] = []
+    links: List[str] = []
+
+class PendingReviewResult(BaseModel):
+    processed: int
+    article_ids: dict[str, int] = {} # approve: link -> new article id
+    missing: List[str] = [] # links not found in the queue
+
+class DiseaseCaseCreate(BaseModel):
+    disease_name: str
+    case_count: int = 0
+    location: Optional[str] = None
+    report_date: Optional[datetime] = None
+
 class WhitelistBase(BaseModel):
     domain: str
     is_active: bool = True
@@ -47,7 +85,27 @@ class KeywordDTO(KeywordBase):
 
 class ScanRequest(BaseModel):
     fetch_unknown: bool = False # If true, also returns unknown articles
+    force: bool = False # If true, ignore the feed cache and re-process every feed
 
 class ScanResult(BaseModel):
     saved_trusted_count: int
     unknown_articles: List[ArticleBase]
+
+class FeedProgress(BaseModel):
+    url: str
+    status: str = "pending" # pending, ok, not_modified, unchanged, error
+    entries: int = 0
+    matched: int = 0
+
+class ScanJobDTO(BaseModel):
+    id: str
+    status: str # pending, running, done, failed
+    fetch_unknown: bool = False
+    force: bool = False
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+    feeds: List[FeedProgress] = []
+    feeds_done: int = 0
+    saved_trusted_count: int = 0
+    unknown_count: int = 0 # staged in pending_articles (GET /api/pending)
+    error: Optional[str] = None
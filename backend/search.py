@@ -0,0 +1,164 @@
+import logging
+import re
+import unicodedata
+from sqlalchemy import text, insert, or_
+from sqlalchemy.orm import Session
+from . import models
+
+logger = logging.getLogger(__name__)
+
+# Full-text search over article title + summary.
+# Both sides are diacritic-folded ("Sốt xuất huyết" -> "sot xuat huyet") and stored in
+# article_search; the actual index depends on the database:
+#   - sqlite: FTS5 external-content table article_search_fts (bm25 ranking)
+#   - mssql:  FULLTEXT INDEX on article_search (CONTAINSTABLE ranking), if Full-Text Search is installed
+#   - other / unavailable: LIKE over the folded columns (correct but unindexed)
+
+FTS_TABLE = "article_search_fts"
+FT_CATALOG = "episcout_catalog"
+
+_backend = None # "fts5", "mssql", "like"; detected once per process
+
+def fold(value: str | None) -> str:
+    if not value:
+        return ""
+    value = value.replace("đ", "d").replace("Đ", "D")
+    value = unicodedata.normalize("NFD", value)
+    value = "".join(ch for ch in value if not unicodedata.combining(ch))
+    return " ".join(value.lower().split())
+
+def query_terms(q: str) -> list[str]:
+    return re.findall(r"\w+", fold(q))
+
+# --- Indexing ---
+
+def search_rows(rows: list[tuple[int, str | None, str | None]]) -> list[dict]:
+    # (article_id, title, summary) -> article_search rows
+    return [
+        {"article_id": article_id, "title": fold(title), "body": fold(summary)}
+        for article_id, title, summary in rows
+    ]
+
+def index_articles(db: Session, rows: list[tuple[int, str | None, str | None]]):
+    """
+    Add (article_id, title, summary) to the search table (executemany).
+    The FTS5 table follows through triggers; SQL Server populates its
+    full-text index via change tracking. Caller commits.
+    """
+    if rows:
+        db.execute(insert(models.ArticleSearch), search_rows(rows))
+
+def ensure_index(engine):
+    """
+    Create the backend specific full-text structures (idempotent).
+    Called by migrate.py and at startup.
+    """
+    global _backend
+    dialect = engine.dialect.name
+    try:
+        if dialect == "sqlite":
+            _ensure_fts5(engine)
+        elif dialect == "mssql":
+            _ensure_mssql_fulltext(engine)
+    except Exception as e:
+        logger.warning(f"Full-text index unavailable, search falls back to LIKE: {e}")
+    _backend = _detect(engine)
+    logger.info(f"Article search backend: {_backend}")
+
+def _ensure_fts5(engine):
+    with engine.begin() as conn:
+        exists = conn.execute(text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": FTS_TABLE}).first()
+        if exists:
+            return
+        conn.execute(text(
+            f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+            "title, body, content='article_search', content_rowid='article_id', tokenize='unicode61')"
+        ))
+        conn.execute(text(
+            f"CREATE TRIGGER article_search_ai AFTER INSERT ON article_search BEGIN "
+            f"INSERT INTO {FTS_TABLE}(rowid, title, body) VALUES (new.article_id, new.title, new.body); END"
+        ))
+        conn.execute(text(
+            f"CREATE TRIGGER article_search_ad AFTER DELETE ON article_search BEGIN "
+            f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, body) VALUES ('delete', old.article_id, old.title, old.body); END"
+        ))
+        conn.execute(text(
+            f"CREATE TRIGGER article_search_au AFTER UPDATE ON article_search BEGIN "
+            f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, body) VALUES ('delete', old.article_id, old.title, old.body); "
+            f"INSERT INTO {FTS_TABLE}(rowid, title, body) VALUES (new.article_id, new.title, new.body); END"
+        ))
+        # Index rows stored before the FTS table existed
+        conn.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+
+def _ensure_mssql_fulltext(engine):
+    # Full-text DDL cannot run inside a transaction
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        installed = conn.execute(text("SELECT FULLTEXTSERVICEPROPERTY('IsFullTextInstalled')")).scalar()
+        if not installed:
+            raise RuntimeError("SQL Server Full-Text Search is not installed")
+        conn.execute(text(
+            f"IF NOT EXISTS (SELECT 1 FROM sys.fulltext_catalogs WHERE name = '{FT_CATALOG}') "
+            f"CREATE FULLTEXT CATALOG {FT_CATALOG}"
+        ))
+        conn.execute(text(
+            "IF NOT EXISTS (SELECT 1 FROM sys.fulltext_indexes WHERE object_id = OBJECT_ID('article_search')) "
+            "CREATE FULLTEXT INDEX ON article_search (title LANGUAGE 0, body LANGUAGE 0) "
+            f"KEY INDEX pk_article_search ON {FT_CATALOG} WITH CHANGE_TRACKING AUTO"
+        ))
+
+def _detect(engine) -> str:
+    try:
+        with engine.connect() as conn:
+            if engine.dialect.name == "sqlite":
+                if conn.execute(text("SELECT 1 FROM sqlite_master WHERE name = :name"), {"name": FTS_TABLE}).first():
+                    return "fts5"
+            elif engine.dialect.name == "mssql":
+                if conn.execute(text("SELECT 1 FROM sys.fulltext_indexes WHERE object_id = OBJECT_ID('article_search')")).first():
+                    return "mssql"
+    except Exception as e:
+        logger.warning(f"Could not detect full-text index: {e}")
+    return "like"
+
+def get_backend(db: Session) -> str:
+    global _backend
+    if _backend is None:
+        _backend = _detect(db.get_bind())
+    return _backend
+
+# --- Querying ---
+
+def search_article_ids(db: Session, q: str, limit: int = 20) -> list[tuple[int, float]]:
+    """
+    Ranked [(article_id, rank)] for query `q`, best first.
+    Every term must match (as a word prefix on the FTS backends).
+    """
+    terms = query_terms(q)
+    if not terms:
+        return []
+
+    backend = get_backend(db)
+    if backend == "fts5":
+        match = " ".join(f'"{t}"*' for t in terms)
+        rows = db.execute(text(
+            f"SELECT rowid AS article_id, bm25({FTS_TABLE}, 2.0, 1.0) AS rank FROM {FTS_TABLE} "
+            f"WHERE {FTS_TABLE} MATCH :match ORDER BY rank LIMIT :limit"
+        ), {"match": match, "limit": limit}).all()
+        # bm25: lower is better; flip so higher rank = better everywhere
+        return [(row.article_id, -row.rank) for row in rows]
+
+    if backend == "mssql":
+        condition = " AND ".join(f'"{t}*"' for t in terms)
+        rows = db.execute(text(
+            "SELECT TOP (:limit) ft.[KEY] AS article_id, ft.[RANK] AS rank "
+            "FROM CONTAINSTABLE(article_search, (title, body), :condition) AS ft ORDER BY ft.[RANK] DESC"
+        ), {"condition": condition, "limit": limit}).all()
+        return [(row.article_id, float(row.rank)) for row in rows]
+
+    # Fallback: unindexed LIKE over the folded text, newest first, title hits ranked higher
+    query = db.query(models.ArticleSearch.article_id, models.ArticleSearch.title)\
+        .join(models.ArticleIdentity, models.ArticleIdentity.id == models.ArticleSearch.article_id)
+    for t in terms:
+        query = query.filter(or_(models.ArticleSearch.title.like(f"%{t}%"), models.ArticleSearch.body.like(f"%{t}%")))
+    rows = query.order_by(models.ArticleIdentity.published_date.desc()).limit(limit).all()
+    ranked = [(row.article_id, float(sum(t in (row.title or "") for t in terms))) for row in rows]
+    return sorted(ranked, key=lambda r: -r[1])
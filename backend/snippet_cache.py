@@ -0,0 +1,107 @@
+import os
+import sqlite3
+import threading
+import time
+
+try:
+    from .urls import canonicalize_url
+except ImportError: # imported by rs.py run as a script
+    from urls import canonicalize_url
+
+# On-disk cache of article snippets for rs.py, shared between runs and processes.
+# Keyed by canonical URL; entries expire after a TTL (failures after a shorter one)
+# and the table is kept under max_entries by evicting the least recently used rows.
+
+DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".cache", "episcout", "snippets.sqlite3")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snippets (
+    url_key TEXT PRIMARY KEY,
+    snippet TEXT,
+    fetched_at REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_snippets_last_access ON snippets (last_access);
+"""
+
+class SnippetCache:
+    def __init__(self, path: str, ttl: float = 24 * 3600, negative_ttl: float = 3600, max_entries: int = 50000):
+        self.path = path
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl # for pages that could not be fetched (snippet NULL)
+        self.max_entries = max_entries
+        self._local = threading.local() # sqlite3 connections are per thread
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._conn() as conn:
+            conn.executescript(SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # WAL + busy timeout: several rs.py runs can read/write the same file
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, url: str) -> tuple[bool, str | None]:
+        """
+        Returns (hit, snippet). A hit may carry None: the page failed recently.
+        """
+        key = canonicalize_url(url)
+        now = time.time()
+        conn = self._conn()
+        row = conn.execute("SELECT snippet, fetched_at FROM snippets WHERE url_key = ?", (key,)).fetchone()
+        if not row:
+            return False, None
+        snippet, fetched_at = row
+        ttl = self.ttl if snippet is not None else self.negative_ttl
+        if fetched_at + ttl < now:
+            return False, None
+        with conn:
+            conn.execute("UPDATE snippets SET last_access = ? WHERE url_key = ?", (now, key))
+        return True, snippet
+
+    def put(self, url: str, snippet: str | None):
+        now = time.time()
+        with self._conn() as conn:
+            conn.execute(
+                "INSERT INTO snippets (url_key, snippet, fetched_at, last_access) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(url_key) DO UPDATE SET snippet = excluded.snippet, "
+                "fetched_at = excluded.fetched_at, last_access = excluded.last_access",
+                (canonicalize_url(url), snippet, now, now)
+            )
+
+    def prune(self) -> int:
+        """
+        Drop expired entries, then the least recently used ones above max_entries.
+        Returns the number of rows removed.
+        """
+        now = time.time()
+        with self._conn() as conn:
+            removed = conn.execute(
+                "DELETE FROM snippets WHERE (snippet IS NOT NULL AND fetched_at < ?) OR (snippet IS NULL AND fetched_at < ?)",
+                (now - self.ttl, now - self.negative_ttl)
+            ).rowcount
+            count = conn.execute("SELECT COUNT(*) FROM snippets").fetchone()[0]
+            if count > self.max_entries:
+                removed += conn.execute(
+                    "DELETE FROM snippets WHERE url_key IN "
+                    "(SELECT url_key FROM snippets ORDER BY last_access LIMIT ?)",
+                    (count - self.max_entries,)
+                ).rowcount
+        return removed
+
+def from_env() -> SnippetCache | None:
+    # RS_CACHE_PATH="" disables the cache
+    path = os.getenv("RS_CACHE_PATH", DEFAULT_PATH)
+    if not path:
+        return None
+    return SnippetCache(
+        path,
+        ttl=float(os.getenv("RS_CACHE_TTL", str(24 * 3600))),
+        negative_ttl=float(os.getenv("RS_CACHE_NEGATIVE_TTL", "3600")),
+        max_entries=int(os.getenv("RS_CACHE_MAX_ENTRIES", "50000"))
+    )
@@ -1,17 +1,24 @@
 from sqlalchemy.orm import Session
 from sqlalchemy import func
-from . import models
+from . import models, cache, metrics
 from datetime import datetime, timedelta
 
 def get_overview_stats(db: Session):
+    # Cached until the TTL expires or crud writes new data
+    return cache.stats_cache.get_or_compute(("overview",), lambda: compute_overview_stats(db))
+
+def get_trend_data(db: Session, days: int = 7):
+    return cache.stats_cache.get_or_compute(("trends", days), lambda: compute_trend_data(db, days))
+
+@metrics.timed()
+def compute_overview_stats(db: Session):
     total_articles = db.query(models.ArticleIdentity).count()
     
-    # Sum total cases tracked
-    total_cases = db.query(func.sum(models.DiseaseCase.case_count)).scalar() or 0
+    # Sum total cases tracked (from the daily rollups, see crud.add_to_case_rollups)
+    total_cases = db.query(func.sum(models.DailyCaseRollup.case_count)).scalar() or 0
     
-    # Count alerts (articles with 'Cảnh báo' tag)
-    # Since tags are in Details, we join.
-    alert_count = db.query(models.ArticleIdentity).join(models.ArticleDetails).filter(models.ArticleDetails.tags.like("%Cảnh báo%")).count()
+    # Count alerts (articles with 'Cảnh báo' tag): index seek on article_tags
+    alert_count = db.query(func.count(models.ArticleTag.id)).filter(models.ArticleTag.tag == "Cảnh báo").scalar() or 0
     
     return {
         "total_articles": total_articles,
@@ -20,22 +27,26 @@ def get_overview_stats(db: Session):
         "last_updated": datetime.utcnow()
     }
 
-def get_trend_data(db: Session, days: int = 7):
+@metrics.timed()
+def compute_trend_data(db: Session, days: int = 7):
     """
     Get case counts by day for the last N days.
+    Reads the materialized daily rollups (index seek on day) instead of
+    grouping disease_cases by a formatted date.
     """
-    start_date = datetime.utcnow() - timedelta(days=days)
+    start_day = (datetime.utcnow() - timedelta(days=days)).date()
     
     results = db.query(
-        func.format(models.DiseaseCase.report_date, 'yyyy-MM-dd').label('date'),
-        func.sum(models.DiseaseCase.case_count).label('cases')
-    ).filter(models.DiseaseCase.report_date >= start_date)\
-     .group_by(func.format(models.DiseaseCase.report_date, 'yyyy-MM-dd'))\
+        models.DailyCaseRollup.day.label('day'),
+        func.sum(models.DailyCaseRollup.case_count).label('cases')
+    ).filter(models.DailyCaseRollup.day >= start_day)\
+     .group_by(models.DailyCaseRollup.day)\
+     .order_by(models.DailyCaseRollup.day)\
      .all()
      
     # Format for chart
     data = []
     for r in results:
-        data.append({"date": r.date, "cases": r.cases})
+        data.append({"date": r.day.strftime('%Y-%m-%d'), "cases": r.cases})
         
     return data
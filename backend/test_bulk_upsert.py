@@ -0,0 +1,90 @@
+from datetime import datetime
+from backend import models, crud, schemas, search
+
+# POST /api/articles/bulk semantics (crud.upsert_articles) and the SQL Server MERGE chunking
+
+def article(i: int, **changes) -> schemas.ArticleCreate:
+    fields = dict(
+        title=f"Thêm {i} ca mắc sởi",
+        link=f"https://vnexpress.net/bai-{i}.html",
+        summary="Tóm tắt",
+        source="vnexpress.net",
+        published_date=datetime(2026, 1, 1, i),
+        keywords_matched="sởi",
+        tags="Mới",
+        is_whitelisted=True
+    )
+    fields.update(changes)
+    return schemas.ArticleCreate(**fields)
+
+def test_upsert_articles(db):
+    first = crud.upsert_articles(db, [article(1), article(2)])
+    assert [item.status for item in first] == ["inserted", "inserted"]
+    ids = {item.link: item.id for item in first}
+
+    assert [item.status for item in crud.upsert_articles(db, [article(1)])] == ["skipped"] # unchanged
+
+    items = crud.upsert_articles(db, [
+        # Tracking-param copy of article 1: same canonical link, new summary
+        article(1, link="https://www.vnexpress.net/bai-1.html?utm_source=fb", summary="Cập nhật"),
+        article(2, title="Cúm A bùng phát", tags="Cảnh báo", keywords_matched="cúm A"),
+        article(3),
+        article(3, title="Repeated link in the same request"),
+    ])
+    assert [item.status for item in items] == ["updated", "updated", "inserted", "skipped"]
+    assert items[0].id == ids["https://vnexpress.net/bai-1.html"]
+    assert items[1].id == ids["https://vnexpress.net/bai-2.html"]
+    assert db.query(models.ArticleIdentity).count() == 3
+
+    # The updated article's tag / keyword / search rows were replaced, not appended
+    article_id = items[1].id
+    assert [row.tag for row in db.query(models.ArticleTag).filter_by(article_id=article_id)] == ["Cảnh báo"]
+    assert [row.keyword for row in db.query(models.ArticleKeyword).filter_by(article_id=article_id)] == ["cúm a"]
+    search_rows = db.query(models.ArticleSearch).filter_by(article_id=article_id).all()
+    assert [row.title for row in search_rows] == ["cum a bung phat"]
+    assert [i for i, _ in search.search_article_ids(db, "bùng phát", 10)] == [article_id]
+    assert search.search_article_ids(db, "thêm 2 ca", 10) == []
+
+    details = db.query(models.ArticleDetails).filter_by(article_id=items[0].id).one()
+    assert details.summary == "Cập nhật"
+
+def test_ingest_after_concurrent_insert(db, monkeypatch):
+    # Another writer stores article 1 between the dedup lookup and the insert
+    crud.ingest_articles(db, [(article(1), [])])
+    lookup = crud.get_existing_link_hashes
+    calls = []
+    def stale_lookup(db, links):
+        calls.append(links)
+        return set() if len(calls) == 1 else lookup(db, links)
+    monkeypatch.setattr(crud, "get_existing_link_hashes", stale_lookup)
+
+    saved = crud.ingest_articles(db, [(article(1), []), (article(2), [])])
+    assert list(saved) == [article(2).link] and len(calls) == 2
+    assert db.query(models.ArticleIdentity).count() == 2
+    assert db.query(models.ArticleDetails).count() == 2
+
+def test_mssql_merge_chunking():
+    columns = ["article_id", "summary", "source", "keywords_matched", "tags", "is_whitelisted"]
+    rows = [{c: i for c in columns} for i in range(1000)]
+    statements = crud.mssql_merge_statements("article_details", ("article_id",), rows)
+    per_statement = crud.MSSQL_MAX_PARAMS // len(columns)
+    assert len(columns) * per_statement <= crud.MSSQL_MAX_PARAMS
+    assert len(statements) == -(-len(rows) // per_statement)
+    assert all(len(params) <= crud.MSSQL_MAX_PARAMS for _, params in statements)
+    assert sum(len(params) for _, params in statements) == len(rows) * len(columns)
+    # Every bind in the SQL has a value and the last chunk carries the last row
+    sql, params = statements[-1]
+    assert all(f":{name}" in sql for name in params)
+    assert params[f"article_id_{len(rows) % per_statement - 1}"] == len(rows) - 1
+    assert "ON t.article_id = s.article_id" in sql and "t.article_id = s.article_id," not in sql
+
+    # Relative increments for the rollup upsert
+    sql, _ = crud.mssql_merge_statements("daily_case_rollups", ("day", "disease_name", "location"), [
+        {"day": None, "disease_name": "sởi", "location": "", "case_count": 1, "report_count": 1}
+    ], increment=("case_count", "report_count"))[0]
+    assert "t.case_count = t.case_count + s.case_count" in sql
+    assert "WITH (HOLDLOCK)" in sql
+
+if __name__ == "__main__":
+    import pytest
+    raise SystemExit(pytest.main(["-q", __file__]))
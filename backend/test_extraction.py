@@ -0,0 +1,33 @@
+from backend.extraction import CaseExtractor, CaseMention
+
+DISEASES = ["sởi", "sốt xuất huyết", "tay chân miệng", "cúm A"]
+
+def test_extract_cases():
+    extractor = CaseExtractor(DISEASES)
+    cases = {
+        # Several triples, each paired with the mentions of its own sentence; deaths are not counted
+        "Hà Nội ghi nhận thêm 235 ca sốt xuất huyết. TP.HCM có hàng chục ca mắc sởi. Đà Nẵng có 2 ca tử vong do sốt xuất huyết": [
+            CaseMention("sốt xuất huyết", 235, "Hà Nội"),
+            CaseMention("sởi", 10, "TP. Hồ Chí Minh"),
+        ],
+        # Title repeated in the summary: reported once
+        "Hà Nội thêm 20 ca sởi\nHà Nội ghi nhận 20 ca mắc sởi mới trong tuần": [CaseMention("sởi", 20, "Hà Nội")],
+        # Number words, districts, thousands separators, old tone placement
+        "Quận 8 có hai trăm ba mươi lăm trường hợp mắc tay chân miệng; Thanh Hoá 1.200 ca cúm A": [
+            CaseMention("tay chân miệng", 235, "TP. Hồ Chí Minh"),
+            CaseMention("cúm A", 1200, "Thanh Hóa"),
+        ],
+        "Cả nước có 1,5 nghìn ca sởi, riêng tỉnh Hòa Bình 12 ca": [
+            CaseMention("sởi", 1500, "Việt Nam"),
+            CaseMention("sởi", 12, "Hòa Bình"),
+        ],
+        # "hòa bình" (peace) is not a location, "năm 2024" is not a count
+        "Năm 2024, vì hòa bình, có mười hai bé mắc sởi": [CaseMention("sởi", 12, "Việt Nam")],
+        "Bệnh nhân 5 tuổi mắc sởi": [],
+        "Ghi nhận 15 ca mắc mới": [], # no disease mentioned
+    }
+    for text, expected in cases.items():
+        assert extractor.extract(text) == expected, (text, extractor.extract(text))
+
+if __name__ == "__main__":
+    test_extract_cases()
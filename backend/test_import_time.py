@@ -0,0 +1,54 @@
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+# Cold-start budget: rs.py and the API module must start fast without network
+# access and without touching the database at import.
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUDGET_SECONDS = float(os.getenv("IMPORT_BUDGET_SECONDS", "3.0"))
+HEAVY_MODULES = ("requests", "bs4", "nltk", "rapidfuzz", "dateutil", "pytz", "feedparser")
+
+def run_timed(args, env=None):
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, *args], cwd=ROOT, env={**os.environ, **(env or {})},
+                            capture_output=True, text=True, timeout=60)
+    elapsed = time.perf_counter() - start
+    assert result.returncode == 0, result.stderr
+    return elapsed, result.stdout
+
+def test_rs_import_is_lightweight():
+    _, out = run_timed(["-c", f"import sys, backend.rs; print(*[m for m in {HEAVY_MODULES!r} if m in sys.modules])"])
+    assert out.strip() == "", f"heavy modules imported by backend.rs: {out.strip()}"
+
+def test_rs_help_within_budget():
+    # Unroutable proxy: any network access at startup would stall or fail
+    elapsed, out = run_timed(["backend/rs.py", "--help"], env={"HTTPS_PROXY": "http://127.0.0.1:9", "HTTP_PROXY": "http://127.0.0.1:9"})
+    assert "--workers" in out
+    assert elapsed < BUDGET_SECONDS, f"rs.py --help took {elapsed:.2f}s (budget {BUDGET_SECONDS}s)"
+
+def test_api_import_does_not_touch_database():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "episcout.db")
+        elapsed, _ = run_timed(["-c", "import backend.main"], env={"DATABASE_URL": f"sqlite:///{db_path}"})
+        assert not os.path.exists(db_path), "importing backend.main created the database"
+    assert elapsed < BUDGET_SECONDS, f"import backend.main took {elapsed:.2f}s (budget {BUDGET_SECONDS}s)"
+
+def test_regex_tokenizer_fallback():
+    sys.path.insert(0, ROOT)
+    from backend import rs
+    saved = rs._nltk_tokenizer
+    rs._nltk_tokenizer = False # as if punkt_tab were not installed
+    try:
+        assert rs.sent_tokenize("Ghi nhận 12 ca sởi. Bộ Y tế cảnh báo!") == ["Ghi nhận 12 ca sởi.", "Bộ Y tế cảnh báo!"]
+        assert rs.word_tokenize("12 ca sởi.") == ["12", "ca", "sởi", "."]
+    finally:
+        rs._nltk_tokenizer = saved
+
+if __name__ == "__main__":
+    test_rs_import_is_lightweight()
+    test_rs_help_within_budget()
+    test_api_import_does_not_touch_database()
+    test_regex_tokenizer_fallback()
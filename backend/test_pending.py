@@ -0,0 +1,72 @@
+import time
+from datetime import datetime
+from backend import models, crud, schemas
+
+# Review queue for unknown-source articles: staging, approval, rejection
+
+def article(i: int, title: str) -> schemas.ArticleCreate:
+    return schemas.ArticleCreate(
+        title=title,
+        link=f"https://baomoi.example/bai-{i}.html",
+        summary="",
+        source="baomoi.example",
+        published_date=datetime(2026, 1, 1, 8),
+        keywords_matched="sởi",
+        is_whitelisted=False
+    )
+
+def test_pending_queue(db):
+    approved, rejected = article(1, "Hà Nội ghi nhận thêm 20 ca sởi"), article(2, "Tin đồn về sởi")
+    assert crud.stage_pending_articles(db, [approved, rejected]) == 2
+
+    # Staging again only bumps last_seen_at
+    queued = crud.get_pending_articles(db)
+    first_seen = {row.link: (row.first_seen_at, row.last_seen_at) for row in queued}
+    time.sleep(0.01)
+    assert crud.stage_pending_articles(db, [approved, rejected]) == 0
+    db.expire_all()
+    rows = crud.get_pending_articles(db)
+    assert len(rows) == 2
+    for row in rows:
+        first_seen_at, last_seen_at = first_seen[row.link]
+        assert row.first_seen_at == first_seen_at and row.last_seen_at > last_seen_at
+
+    # Approve: article + cases + rollup written, queue row removed
+    rows, missing = crud.find_pending_articles(db, [], [approved.link, "https://nowhere.example/x"])
+    assert missing == ["https://nowhere.example/x"]
+    saved = crud.approve_pending_articles(db, rows, ["sởi"])
+    article_id = saved[approved.link]
+    stored = db.query(models.ArticleIdentity).filter_by(id=article_id).one()
+    assert stored.title == approved.title and stored.details.is_whitelisted is False
+    cases = db.query(models.DiseaseCase).filter_by(article_id=article_id).all()
+    assert [(c.disease_name, c.case_count, c.location) for c in cases] == [("sởi", 20, "Hà Nội")]
+    rollup = db.query(models.DailyCaseRollup).one()
+    assert (rollup.disease_name, rollup.location, rollup.case_count, rollup.report_count) == ("sởi", "Hà Nội", 20, 1)
+    assert [row.link for row in crud.get_pending_articles(db)] == [rejected.link]
+
+    # Reject: the row stays queued as "rejected", and is not offered again
+    rows, _ = crud.find_pending_articles(db, [], [rejected.link])
+    assert crud.reject_pending_articles(db, rows) == 1
+    db.expire_all()
+    assert crud.get_pending_articles(db) == []
+    assert [row.link for row in crud.get_pending_articles(db, status="rejected")] == [rejected.link]
+    assert crud.stage_pending_articles(db, [approved, rejected]) == 0 # stored / already queued
+    assert db.query(models.PendingArticle).count() == 1
+
+def test_stage_after_concurrent_insert(db, monkeypatch):
+    # Another scan queues article 1 between the queue lookup and the insert
+    crud.stage_pending_articles(db, [article(1, "Thêm 3 ca sởi")])
+    lookup = crud.get_queued_link_hashes
+    calls = []
+    def stale_lookup(db, hashes):
+        calls.append(hashes)
+        return set() if len(calls) == 1 else lookup(db, hashes)
+    monkeypatch.setattr(crud, "get_queued_link_hashes", stale_lookup)
+
+    assert crud.stage_pending_articles(db, [article(1, "Thêm 3 ca sởi"), article(2, "Thêm 4 ca sởi")]) == 1
+    assert len(calls) == 2
+    assert sorted(row.link for row in crud.get_pending_articles(db)) == [article(1, "").link, article(2, "").link]
+
+if __name__ == "__main__":
+    import pytest
+    raise SystemExit(pytest.main(["-q", __file__]))
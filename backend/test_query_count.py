@@ -0,0 +1,38 @@
+from sqlalchemy import event
+from datetime import datetime, timedelta
+from backend import crud, schemas
+
+# Regression guard: listing a page of articles must stay a single query (no N+1 on `details`)
+
+PAGE_SIZE = 100
+
+def test_article_listing_query_count(engine, db):
+    now = datetime.utcnow()
+    crud.ingest_articles(db, [
+        (schemas.ArticleCreate(
+            title=f"Thêm {i} ca mắc sởi",
+            link=f"https://vnexpress.net/bai-{i}.html",
+            summary="Tóm tắt",
+            source="vnexpress.net",
+            published_date=now - timedelta(minutes=i),
+            keywords_matched="sởi",
+            tags="Mới",
+            is_whitelisted=True
+        ), [])
+        for i in range(PAGE_SIZE + 20)
+    ])
+    db.expunge_all()
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda conn, cursor, statement, *args: statements.append(statement))
+
+    articles = crud.get_articles(db, limit=PAGE_SIZE)
+    page = [schemas.ArticleDTO.model_validate(a) for a in articles]
+
+    assert len(page) == PAGE_SIZE
+    assert page[0].summary == "Tóm tắt" and page[0].is_whitelisted
+    assert len(statements) == 1, f"Article listing issued {len(statements)} queries (N+1?)"
+
+if __name__ == "__main__":
+    import pytest
+    raise SystemExit(pytest.main(["-q", __file__]))
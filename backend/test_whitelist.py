@@ -0,0 +1,24 @@
+from backend.crawler import get_domain
+from backend.whitelist import DomainTrie
+
+def test_whitelist_matching():
+    trie = DomainTrie(["vnexpress.net", "https://www.Dantri.com.vn/suc-khoe", "*.vov.vn", "localhost"])
+    cases = {
+        "https://vnexpress.net/a.html": True,
+        "https://suckhoe.vnexpress.net/a.html": True,
+        "https://WWW.dantri.com.vn/a": True,
+        "https://vov.vn/a": True,
+        "http://localhost:8000/a": True,
+        # Substrings of a listed domain are not subdomains
+        "https://evilvnexpress.net/a": False,
+        "https://vnexpress.net.example/a": False,
+        "https://user@vnexpress.net.example:443/a": False,
+        "https://com.vn/a": False,
+        "http://127.0.0.1:8000/a": False,
+    }
+    for url, expected in cases.items():
+        assert trie.matches(get_domain(url)) == expected, url
+    assert len(trie) == 4
+
+if __name__ == "__main__":
+    test_whitelist_matching()
@@ -0,0 +1,56 @@
+import hashlib
+import re
+from urllib.parse import urlparse, urlunparse, parse_qsl, urlencode, unquote
+
+# Query parameters that only track the referrer / campaign
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "gclsrc", "dclid", "msclkid", "yclid", "igshid",
+    "mc_cid", "mc_eid", "_ga", "ref", "ref_src", "zarsrc", "gidzl"
+}
+TRACKING_PREFIXES = ("utm_",)
+
+def extract_original_link(url: str) -> str:
+    # Redirect wrappers such as ".../redirect?url=https://..." (same idea as rs.extract_original_link)
+    match = re.search(r'[?&]url=(https?(?:://|%3A%2F%2F)[^&]+)', url, re.IGNORECASE)
+    return unquote(match.group(1)) if match else url
+
+def canonicalize_url(url: str) -> str:
+    """
+    Normalize an article URL so syndicated / tracked copies compare equal:
+    unwrap redirects, force https, lowercase host, drop "www." and default
+    ports, strip tracking params and fragments, sort the remaining query.
+    """
+    if not url:
+        return ""
+    url = extract_original_link(url.strip())
+    try:
+        parsed = urlparse(url)
+    except ValueError: # e.g. unbalanced "[" of an IPv6 host
+        return url
+
+    try:
+        host = (parsed.hostname or "").lower()
+        port = parsed.port
+    except ValueError:
+        # Malformed port ("x.vn:abc"): keep the raw netloc rather than failing the batch
+        host, port = parsed.netloc.lower(), None
+    if host.startswith("www."):
+        host = host[4:]
+    if port and port not in (80, 443):
+        host = f"{host}:{port}"
+
+    path = parsed.path or "/"
+    if len(path) > 1:
+        path = path.rstrip("/")
+
+    query = [
+        (k, v) for k, v in parse_qsl(parsed.query, keep_blank_values=True)
+        if k.lower() not in TRACKING_PARAMS and not k.lower().startswith(TRACKING_PREFIXES)
+    ]
+    query.sort()
+
+    return urlunparse(("https", host, path, "", urlencode(query), ""))
+
+def link_hash(url: str) -> str:
+    # Fixed-width (64 hex chars) key for the canonical URL index
+    return hashlib.sha256(canonicalize_url(url).encode("utf-8")).hexdigest()
@@ -0,0 +1,85 @@
+import threading
+
+# Trusted-source check for scanned articles: a suffix trie over the reversed
+# labels of the whitelisted domains ("vnexpress.net" -> net -> vnexpress), so
+# a host is trusted when it is a listed domain or one of its subdomains, in
+# O(labels) whatever the size of the whitelist.
+
+# Used while the whitelist table has no active rows
+DEFAULT_DOMAINS = [
+    "vnexpress.net", "dantri.com.vn", "tuoitre.vn", "thanhnien.vn",
+    "suckhoedoisong.vn", "tienphong.vn", "laodong.vn",
+    "vietnamnet.vn", "nhandan.vn", "cand.com.vn"
+]
+
+_END = "" # marks the last label of a listed domain (labels are never empty)
+
+def normalize_domain(value: str) -> str:
+    # "https://www.VnExpress.net:443/suc-khoe" -> "vnexpress.net"; "*.vov.vn" -> "vov.vn"
+    value = value.strip().lower()
+    if "://" in value:
+        value = value.split("://", 1)[1]
+    value = value.split("/", 1)[0].split("@")[-1].split(":", 1)[0].strip(".")
+    for prefix in ("*.", "www."):
+        if value.startswith(prefix):
+            value = value[len(prefix):]
+    return value
+
+class DomainTrie:
+    def __init__(self, domains: list[str] = ()):
+        self._root = {}
+        self.size = 0
+        for domain in domains:
+            self.add(domain)
+
+    def add(self, domain: str):
+        labels = normalize_domain(domain).split(".")
+        if not all(labels):
+            return
+        node = self._root
+        for label in reversed(labels):
+            node = node.setdefault(label, {})
+        if _END not in node:
+            node[_END] = True
+            self.size += 1
+
+    def matches(self, host: str) -> bool:
+        # host: lowercase hostname without port (crawler.get_domain)
+        node = self._root
+        for label in reversed(host.split(".")):
+            node = node.get(label)
+            if node is None:
+                return False
+            if _END in node:
+                return True
+        return False
+
+    def __len__(self):
+        return self.size
+
+_lock = threading.Lock()
+_trie: DomainTrie | None = None
+_signature = None
+
+def get_whitelist(signature, load) -> DomainTrie:
+    """
+    Return the trie of active whitelisted domains. load() -> domains is
+    only called when the trie was invalidated or `signature` (a cheap
+    summary of the table, see crud.get_whitelist_signature) changed, e.g.
+    after a write by another worker process.
+    """
+    global _trie, _signature
+    trie = _trie
+    if trie is not None and _signature == signature:
+        return trie
+    with _lock:
+        if _trie is None or _signature != signature:
+            domains = load()
+            _trie = DomainTrie(domains or DEFAULT_DOMAINS)
+            _signature = signature
+        return _trie
+
+def invalidate():
+    global _trie
+    with _lock:
+        _trie = None
@@ -9,7 +9,7 @@ import { useToast } from "@/components/ui/use-toast";
 import { Switch } from "@/components/ui/switch";
 import { Label } from "@/components/ui/label";
 import { ScanResultModal } from "./ScanResultModal";
-import { Article, Keyword } from "@/types";
+import { Article, Keyword, ScanEvent } from "@/types";
 
 const KeywordMonitoring = () => {
   const { toast } = useToast();
@@ -99,37 +99,67 @@ const KeywordMonitoring = () => {
     });
 
     try {
-      const res = await fetch("/api/scan", {
+      const res = await fetch("/api/scan/stream", {
         method: "POST",
         headers: { "Content-Type": "application/json" },
         body: JSON.stringify({ fetch_unknown: scanAll }),
       });
+      if (!res.ok || !res.body) throw new Error("Scan failed");
 
-      if (res.ok) {
-        const result = await res.json();
-
-        // Refresh articles list
-        fetchArticles();
+      // NDJSON stream of the (shared) background scan job: one event per line,
+      // handled as it arrives; blank keep-alive lines are skipped
+      let savedCount = 0;
+      let unknownCount = 0;
+      setUnknownArticles([]);
+      const handleEvent = (event: ScanEvent) => {
+        if (event.type === "article" && !event.trusted) {
+          unknownCount += 1;
+          setUnknownArticles((prev) => [...prev, event.article]);
+          setShowModal(true);
+        } else if (event.type === "saved") {
+          savedCount = event.total;
+          fetchArticles();
+        } else if (event.type === "error") {
+          throw new Error(event.error);
+        }
+      };
 
-        if (result.saved_trusted_count > 0) {
-          toast({
-            title: "Quét hoàn tất",
-            description: `Đã tự động lưu ${result.saved_trusted_count} bài viết từ nguồn uy tín.`,
-          });
-        } else {
-          if (result.unknown_articles.length === 0) {
-            toast({
-              title: "Quét hoàn tất",
-              description: "Không tìm thấy bài viết mới phù hợp.",
-            });
-          }
+      const reader = res.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = "";
+      for (;;) {
+        const { done, value } = await reader.read();
+        buffer += decoder.decode(value, { stream: !done });
+        const lines = buffer.split("\n");
+        buffer = lines.pop() ?? "";
+        for (const line of lines) {
+          if (line.trim()) handleEvent(JSON.parse(line));
         }
+        if (done) break;
+      }
 
-        if (result.unknown_articles.length > 0) {
-          setUnknownArticles(result.unknown_articles);
-          setShowModal(true);
+      // Unknown-source matches are queued server-side, including ones from earlier scans
+      if (scanAll) {
+        const pendingRes = await fetch("/api/pending?limit=200");
+        if (pendingRes.ok) {
+          const queued: Article[] = await pendingRes.json();
+          unknownCount = queued.length;
+          setUnknownArticles(queued);
+          setShowModal(queued.length > 0);
         }
       }
+
+      if (savedCount > 0) {
+        toast({
+          title: "Quét hoàn tất",
+          description: `Đã tự động lưu ${savedCount} bài viết từ nguồn uy tín.`,
+        });
+      } else if (unknownCount === 0) {
+        toast({
+          title: "Quét hoàn tất",
+          description: "Không tìm thấy bài viết mới phù hợp.",
+        });
+      }
     } catch (e) {
       toast({ title: "Lỗi", description: "Quét thất bại.", variant: "destructive" });
     } finally {
@@ -139,13 +169,15 @@ const KeywordMonitoring = () => {
 
   const handleSaveUnknown = async (articlesToSave: Article[]) => {
     try {
-      const res = await fetch("/api/articles/save", {
+      // One request for the whole selection, approved in a single transaction
+      const res = await fetch("/api/pending/approve", {
         method: "POST",
         headers: { "Content-Type": "application/json" },
-        body: JSON.stringify(articlesToSave),
+        body: JSON.stringify({ links: articlesToSave.map((a) => a.link) }),
       });
       if (res.ok) {
-        toast({ title: "Thành công", description: `Đã lưu ${articlesToSave.length} bài viết.` });
+        const result: { processed: number } = await res.json();
+        toast({ title: "Thành công", description: `Đã lưu ${result.processed} bài viết.` });
         fetchArticles();
       }
     } catch (e) {
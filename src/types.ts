@@ -20,6 +20,37 @@ export interface ScanResult {
   unknown_articles: Article[];
 }
 
+export interface FeedProgress {
+  url: string;
+  status: "pending" | "ok" | "not_modified" | "unchanged" | "error";
+  entries: number;
+  matched: number;
+}
+
+export interface ScanJob {
+  id: string;
+  status: "pending" | "running" | "done" | "failed";
+  fetch_unknown: boolean;
+  force: boolean;
+  created_at: string;
+  finished_at?: string;
+  feeds: FeedProgress[];
+  feeds_done: number;
+  saved_trusted_count: number;
+  unknown_count: number;
+  error?: string;
+}
+
+// Events of POST /api/scan/stream (one JSON object per line)
+export type ScanEvent =
+  | { type: "job"; id: string }
+  | { type: "article"; trusted: boolean; article: Article }
+  | { type: "feed"; url: string; status: FeedProgress["status"]; entries: number; matched: number }
+  | { type: "saved"; count: number; total: number }
+  | { type: "done"; saved_trusted_count: number; unknown_count: number }
+  | { type: "lagged"; missed: number }
+  | { type: "error"; error: string };
+
 export interface Keyword {
   id?: number;
   text: string;